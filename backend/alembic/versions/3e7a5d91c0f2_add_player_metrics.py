@@ -0,0 +1,45 @@
+"""add_player_metrics
+
+Revision ID: 3e7a5d91c0f2
+Revises: 8c1f4e2a9b3d
+Create Date: 2026-10-16 10:03:17.551902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e7a5d91c0f2'
+down_revision: Union[str, None] = '8c1f4e2a9b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('player_metrics',
+    sa.Column('player_id', sa.Integer(), nullable=False),
+    sa.Column('games_played', sa.Integer(), nullable=True),
+    sa.Column('season_points', sa.Float(), nullable=True),
+    sa.Column('season_rebounds', sa.Float(), nullable=True),
+    sa.Column('season_assists', sa.Float(), nullable=True),
+    sa.Column('season_pra', sa.Float(), nullable=True),
+    sa.Column('last5_points', sa.Float(), nullable=True),
+    sa.Column('last5_rebounds', sa.Float(), nullable=True),
+    sa.Column('last5_assists', sa.Float(), nullable=True),
+    sa.Column('last5_pra', sa.Float(), nullable=True),
+    sa.Column('last10_points', sa.Float(), nullable=True),
+    sa.Column('last10_rebounds', sa.Float(), nullable=True),
+    sa.Column('last10_assists', sa.Float(), nullable=True),
+    sa.Column('last10_pra', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['player_id'], ['players.id'], ),
+    sa.PrimaryKeyConstraint('player_id')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('player_metrics')
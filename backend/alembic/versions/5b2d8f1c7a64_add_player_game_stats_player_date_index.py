@@ -0,0 +1,26 @@
+"""add_player_game_stats_player_date_index
+
+Revision ID: 5b2d8f1c7a64
+Revises: 3e7a5d91c0f2
+Create Date: 2026-10-16 11:41:07.553190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2d8f1c7a64'
+down_revision: Union[str, None] = '3e7a5d91c0f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_player_game_stats_player_date', 'player_game_stats', ['player_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_player_game_stats_player_date', table_name='player_game_stats')
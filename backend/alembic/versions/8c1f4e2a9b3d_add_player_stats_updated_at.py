@@ -0,0 +1,26 @@
+"""add_player_stats_updated_at
+
+Revision ID: 8c1f4e2a9b3d
+Revises: 26d0f29d827f
+Create Date: 2026-10-16 09:12:41.208417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1f4e2a9b3d'
+down_revision: Union[str, None] = '26d0f29d827f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('players', sa.Column('stats_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('players', 'stats_updated_at')
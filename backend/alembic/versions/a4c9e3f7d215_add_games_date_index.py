@@ -0,0 +1,26 @@
+"""add_games_date_index
+
+Revision ID: a4c9e3f7d215
+Revises: 5b2d8f1c7a64
+Create Date: 2026-10-16 11:40:12.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c9e3f7d215'
+down_revision: Union[str, None] = '5b2d8f1c7a64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_games_date', 'games', ['date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_games_date', table_name='games')
@@ -70,7 +70,7 @@ async def compare_prediction(
             )
         
         # Compare with betting line
-        comparison = odds_comparison.compare_prediction(
+        comparison = await odds_comparison.acompare_prediction(
             player_info['name'],
             predictions[request.stat_type],
             request.stat_type
@@ -1,5 +1,5 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.ext.declarative import declarative_base
@@ -34,6 +34,30 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+def enable_sqlite_bulk_pragmas(engine):
+    """
+    Tune SQLite connections on an engine for bulk writes.
+
+    WAL journaling with synchronous=NORMAL avoids an fsync on every commit, and
+    a larger page cache plus in-memory temp storage keeps big inserts off disk.
+    Meant for populate/ingest scripts; does nothing for non-SQLite engines.
+
+    Args:
+        engine: Sync Engine or AsyncEngine to configure
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    if sync_engine.dialect.name != "sqlite":
+        return
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA cache_size=-64000")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
 def get_db():
     """Get synchronous database session."""
     db = SessionLocal()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Boolean, JSON, UniqueConstraint, Table
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Boolean, JSON, UniqueConstraint, Table, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -79,6 +79,7 @@ class Player(Base):
     birth_date = Column(String(50))
     image_url = Column(String(255))
     api_id = Column(Integer, unique=True)  # Store the external API ID
+    stats_updated_at = Column(DateTime, nullable=True)  # Bumped when new game stats are ingested
     
     # Foreign keys
     team_id = Column(Integer, ForeignKey("teams.id"))
@@ -122,6 +123,9 @@ class PlayerStats(Base):
 
 class Game(Base):
     __tablename__ = "games"
+    __table_args__ = (
+        Index('ix_games_date', 'date'),
+    )
 
     id = Column(Integer, primary_key=True)
     api_id = Column(Integer, unique=True)  # BallDontLie game ID
@@ -153,6 +157,7 @@ class PlayerGameStats(Base):
     __tablename__ = "player_game_stats"
     __table_args__ = (
         UniqueConstraint('player_id', 'game_id', name='uix_player_game'),
+        Index('ix_player_game_stats_player_date', 'player_id', 'date'),
     )
 
     id = Column(Integer, primary_key=True)
@@ -205,6 +210,35 @@ class PlayerGameStats(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
+class PlayerMetrics(Base):
+    """Materialized season and rolling averages per player, refreshed on stats ingestion."""
+    __tablename__ = "player_metrics"
+
+    player_id = Column(Integer, ForeignKey("players.id"), primary_key=True)
+    games_played = Column(Integer, default=0)
+
+    # Season averages
+    season_points = Column(Float)
+    season_rebounds = Column(Float)
+    season_assists = Column(Float)
+    season_pra = Column(Float)
+
+    # Last 5 games
+    last5_points = Column(Float)
+    last5_rebounds = Column(Float)
+    last5_assists = Column(Float)
+    last5_pra = Column(Float)
+
+    # Last 10 games
+    last10_points = Column(Float)
+    last10_rebounds = Column(Float)
+    last10_assists = Column(Float)
+    last10_pra = Column(Float)
+
+    # Metadata
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class SportsbookLine(Base):
     __tablename__ = "sportsbook_lines"
 
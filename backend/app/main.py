@@ -42,7 +42,8 @@ app.add_middleware(
 # Import local modules after app creation
 from .config import get_settings, Settings
 from .utils.api_helpers import get_api_headers
-from .services.api_sports import APISportsService, get_api_service
+from .utils.odds import close_odds_api
+from .services.api_sports import APISportsService, close_api_service, get_api_service
 from .routes import predictions
 from .routers import nba, scraper, slate, player_detail, mock_slate, auth
 from .services.prediction_service import PredictionService
@@ -666,6 +667,13 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error in startup event: {e}")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release shared HTTP client sessions on shutdown."""
+    await scraper.scraper.close()
+    await close_api_service()
+    await close_odds_api()
+
 async def clear_expired_cache_task():
     """Background task to periodically clear expired cache entries."""
     while True:
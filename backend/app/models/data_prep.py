@@ -1,6 +1,6 @@
 import pandas as pd
 import numpy as np
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from ..services.api_sports import APISportsService
 
 class DataPreprocessor:
@@ -14,6 +14,11 @@ class DataPreprocessor:
         ]
         
         self.target_columns = ['points', 'assists', 'rebounds']
+        
+        # Min-max statistics from fit(); 1/range is 0 for constant features
+        self._min: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+        self.feature_ranges: Dict = {}
 
     async def fetch_training_data(self, api_service: APISportsService, season: str = "2023") -> pd.DataFrame:
         """
@@ -53,23 +58,53 @@ class DataPreprocessor:
         
         return X, y
 
+    @staticmethod
+    def _min_scale(X: np.ndarray) -> Tuple[np.ndarray, np.ndarray, Dict]:
+        """
+        Per-feature minimum, 1/range scale and ranges dict for min-max scaling
+        """
+        min_val = X.min(axis=0)
+        max_val = X.max(axis=0)
+        span = max_val - min_val
+        scale = np.divide(1.0, span, out=np.zeros(span.shape), where=span > 0)
+        ranges = {
+            i: {'min': lo, 'max': hi}
+            for i, (lo, hi) in enumerate(zip(min_val.tolist(), max_val.tolist()))
+        }
+        return min_val, scale, ranges
+
+    def fit(self, X: np.ndarray) -> 'DataPreprocessor':
+        """
+        Cache min-max statistics from training features for later normalization
+        """
+        self._min, self._scale, self.feature_ranges = self._min_scale(np.asarray(X, dtype=np.float64))
+        return self
+
+    def transform_into(self, X: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """
+        Write fitted min-max normalized X into a caller-supplied buffer (which may be X itself)
+        """
+        np.subtract(X, self._min, out=out)
+        np.multiply(out, self._scale, out=out)
+        return out
+
     def normalize_features(self, X: np.ndarray) -> Tuple[np.ndarray, Dict]:
         """
         Normalize features using min-max scaling
+        Uses the ranges from fit() when fitted, otherwise X's own ranges.
+        Returns a new array (float inputs keep their dtype, others become float64);
+        use transform_into to normalize into an existing buffer.
         """
-        feature_ranges = {}
-        X_normalized = np.zeros_like(X)
+        dtype = X.dtype if np.issubdtype(X.dtype, np.floating) else np.float64
         
-        for i in range(X.shape[1]):
-            min_val = np.min(X[:, i])
-            max_val = np.max(X[:, i])
-            feature_ranges[i] = {'min': min_val, 'max': max_val}
-            
-            if max_val > min_val:
-                X_normalized[:, i] = (X[:, i] - min_val) / (max_val - min_val)
-            else:
-                X_normalized[:, i] = 0
-                
+        if self._min is None:
+            min_val, scale, feature_ranges = self._min_scale(X)
+        else:
+            min_val, scale, feature_ranges = self._min, self._scale, self.feature_ranges
+        
+        X_normalized = np.empty(X.shape, dtype=dtype)
+        np.subtract(X, min_val, out=X_normalized)
+        np.multiply(X_normalized, scale, out=X_normalized)
         return X_normalized, feature_ranges
 
     def prepare_single_player(self, player_stats: Dict) -> np.ndarray:
@@ -79,4 +114,4 @@ class DataPreprocessor:
         features = []
         for col in self.feature_columns:
             features.append(player_stats.get(col, 0))
-        return np.array(features).reshape(1, -1) 
\ No newline at end of file
+        return np.asarray(features, dtype=np.float32).reshape(1, -1) 
\ No newline at end of file
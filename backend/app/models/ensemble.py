@@ -1,8 +1,14 @@
 import numpy as np
+from collections import OrderedDict
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.neural_network import MLPRegressor
 from typing import Dict, List, Any
 
+TARGETS = ('points', 'assists', 'rebounds')
+
+# Most recent predictions kept per ensemble, keyed by the exact feature bytes
+PREDICTION_CACHE_MAXSIZE = 4096
+
 class EnsemblePredictor:
     def __init__(self):
         self.models = {
@@ -10,6 +16,10 @@ class EnsemblePredictor:
             'nn': MLPRegressor(hidden_layer_sizes=(50, 25), max_iter=1000, random_state=42)
         }
         self.is_fitted = False
+        # Equal blend by default; the vector follows self.models order for the einsum in predict
+        self.weights = {name: 1 / len(self.models) for name in self.models}
+        self._weight_vec = np.array(list(self.weights.values()))
+        self._cache: "OrderedDict[tuple, Dict[str, float]]" = OrderedDict()
 
     def prepare_features(self, recent_games: List[Dict[str, Any]]) -> np.ndarray:
         """Convert recent games into feature matrix"""
@@ -26,13 +36,27 @@ class EnsemblePredictor:
                 float(game.get('fta', 0))
             ]
             features.append(game_features)
-        return np.array(features)
+        # float32 end to end: the forest's trees work in float32 and the MLP keeps the input dtype
+        return np.array(features, dtype=np.float32)
 
     def fit(self, X: np.ndarray, y: np.ndarray):
         """Train all models in the ensemble"""
+        # Training in float32 gives the MLP float32 weights, so inference never upcasts
+        X = np.asarray(X, dtype=np.float32)
         for name, model in self.models.items():
             model.fit(X, y)
         self.is_fitted = True
+        self._cache.clear()
+
+    def update_weights(self, weights: Dict[str, float]):
+        """Set per-model blend weights; they must cover every model and sum to 1"""
+        if set(weights) != set(self.models):
+            raise ValueError(f"Weights must be given for exactly these models: {sorted(self.models)}")
+        if not np.isclose(sum(weights.values()), 1.0):
+            raise ValueError("Model weights must sum to 1.0")
+        self.weights = dict(weights)
+        self._weight_vec = np.array([weights[name] for name in self.models])
+        self._cache.clear()
 
     def predict(self, recent_games: List[Dict[str, Any]]) -> Dict[str, float]:
         """Make predictions using the ensemble"""
@@ -52,13 +76,24 @@ class EnsemblePredictor:
                 'rebounds': 5.0
             }
 
-        # Make predictions for each stat
-        predictions = {}
-        for stat in ['points', 'assists', 'rebounds']:
-            stat_predictions = []
-            for model in self.models.values():
-                pred = model.predict(X)
-                stat_predictions.append(pred[-1])  # Use last prediction
-            predictions[stat] = float(np.mean(stat_predictions))
+        # Repeat requests for the same recent games skip the forward pass entirely
+        key = (X.shape, X.tobytes())
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return dict(cached)
+
+        # Run each model once, stack to (models, games, targets) and blend in one reduction
+        preds = np.stack([
+            np.asarray(model.predict(X)).reshape(len(X), -1) for model in self.models.values()
+        ])
+        blended = np.einsum('m,mnt->nt', self._weight_vec, preds)
+
+        # Use the prediction for the last game; a single-target fit applies to every stat
+        last = np.broadcast_to(blended[-1], (len(TARGETS),))
+        predictions = {stat: float(value) for stat, value in zip(TARGETS, last)}
 
-        return predictions 
\ No newline at end of file
+        self._cache[key] = predictions
+        if len(self._cache) > PREDICTION_CACHE_MAXSIZE:
+            self._cache.popitem(last=False)
+        return dict(predictions) 
\ No newline at end of file
@@ -18,6 +18,7 @@ class TraditionalMLTrainer:
             n_estimators=100,
             learning_rate=0.1,
             max_depth=5,
+            tree_method="hist",  # Histogram (quantized bin) training and CPU inference
             random_state=42
         )
         
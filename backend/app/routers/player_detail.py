@@ -7,7 +7,7 @@ from pydantic import BaseModel
 
 from ..db.database import get_async_db
 from ..db.models import Player
-from ..services.metrics_service import MetricsService
+from ..services.metrics_service import MetricsService, MARKETS, average_or_none
 
 
 router = APIRouter(prefix="/api/player", tags=["player"])
@@ -106,39 +106,31 @@ async def get_player_detail(
         jersey_number=player.jersey_number
     )
 
-    # Compute season averages
-    season_avg_points = await MetricsService.compute_season_average(db, player_id, 'points')
-    season_avg_rebounds = await MetricsService.compute_season_average(db, player_id, 'rebounds')
-    season_avg_assists = await MetricsService.compute_season_average(db, player_id, 'assists')
-    season_avg_pra = await MetricsService.compute_season_average(db, player_id, 'pra')
+    # Compute season and rolling averages for every market in one pass
+    averages = await MetricsService.get_market_averages(db, player_id)
+
+    def _avg(window: str, market: str) -> Optional[float]:
+        if not averages:
+            return None
+        value = average_or_none(averages[window][MARKETS.index(market)])
+        return round(value, 1) if value is not None else None
 
     season_averages = SeasonAverages(
-        points=round(season_avg_points, 1) if season_avg_points else None,
-        rebounds=round(season_avg_rebounds, 1) if season_avg_rebounds else None,
-        assists=round(season_avg_assists, 1) if season_avg_assists else None,
-        pra=round(season_avg_pra, 1) if season_avg_pra else None
+        points=_avg('season', 'points'),
+        rebounds=_avg('season', 'rebounds'),
+        assists=_avg('season', 'assists'),
+        pra=_avg('season', 'pra')
     )
 
-    # Compute rolling averages
-    last5_points = await MetricsService.compute_rolling_averages(db, player_id, 'points', 5)
-    last5_rebounds = await MetricsService.compute_rolling_averages(db, player_id, 'rebounds', 5)
-    last5_assists = await MetricsService.compute_rolling_averages(db, player_id, 'assists', 5)
-    last5_pra = await MetricsService.compute_rolling_averages(db, player_id, 'pra', 5)
-
-    last10_points = await MetricsService.compute_rolling_averages(db, player_id, 'points', 10)
-    last10_rebounds = await MetricsService.compute_rolling_averages(db, player_id, 'rebounds', 10)
-    last10_assists = await MetricsService.compute_rolling_averages(db, player_id, 'assists', 10)
-    last10_pra = await MetricsService.compute_rolling_averages(db, player_id, 'pra', 10)
-
     rolling_averages = RollingAverages(
-        last5_points=round(last5_points, 1) if last5_points else None,
-        last5_rebounds=round(last5_rebounds, 1) if last5_rebounds else None,
-        last5_assists=round(last5_assists, 1) if last5_assists else None,
-        last5_pra=round(last5_pra, 1) if last5_pra else None,
-        last10_points=round(last10_points, 1) if last10_points else None,
-        last10_rebounds=round(last10_rebounds, 1) if last10_rebounds else None,
-        last10_assists=round(last10_assists, 1) if last10_assists else None,
-        last10_pra=round(last10_pra, 1) if last10_pra else None
+        last5_points=_avg('last5', 'points'),
+        last5_rebounds=_avg('last5', 'rebounds'),
+        last5_assists=_avg('last5', 'assists'),
+        last5_pra=_avg('last5', 'pra'),
+        last10_points=_avg('last10', 'points'),
+        last10_rebounds=_avg('last10', 'rebounds'),
+        last10_assists=_avg('last10', 'assists'),
+        last10_pra=_avg('last10', 'pra')
     )
 
     # Get game logs
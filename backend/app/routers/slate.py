@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from pydantic import BaseModel
 
 from ..db.database import get_async_db
@@ -59,11 +59,14 @@ async def get_daily_slate(
     else:
         slate_date = datetime.now()
 
+    day_start = slate_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    day_end = day_start + timedelta(days=1)
+
     # Get all games for this date
     games_query = select(Game).where(
         and_(
-            Game.date >= slate_date.replace(hour=0, minute=0, second=0),
-            Game.date < slate_date.replace(hour=23, minute=59, second=59)
+            Game.date >= day_start,
+            Game.date < day_end
         )
     )
     games_result = await db.execute(games_query)
@@ -78,8 +81,8 @@ async def get_daily_slate(
     # Get all players with lines for this date
     lines_query = select(SportsbookLine).where(
         and_(
-            SportsbookLine.date >= slate_date.replace(hour=0, minute=0, second=0),
-            SportsbookLine.date < slate_date.replace(hour=23, minute=59, second=59)
+            SportsbookLine.date >= day_start,
+            SportsbookLine.date < day_end
         )
     )
     lines_result = await db.execute(lines_query)
@@ -88,6 +91,9 @@ async def get_daily_slate(
     # Group lines by player
     player_ids = list(set([line.player_id for line in lines]))
 
+    # Get market data for every player in one batch
+    markets_by_player = await MetricsService.get_players_markets_data(db, player_ids, slate_date)
+
     slate_players = []
 
     for player_id in player_ids:
@@ -110,8 +116,7 @@ async def get_daily_slate(
                     opponent = game.home_team
                     break
 
-        # Get market data for this player
-        markets_data = await MetricsService.get_player_markets_data(db, player_id, slate_date)
+        markets_data = markets_by_player.get(player_id, [])
 
         slate_players.append(SlatePlayer(
             player_id=player.id,
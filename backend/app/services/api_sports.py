@@ -1,4 +1,5 @@
 from typing import Dict, List, Optional
+import functools
 import httpx
 import os
 import logging
@@ -18,10 +19,13 @@ class APISportsService:
             "X-RapidAPI-Key": os.environ.get("NBA_API_KEY"),
             "X-RapidAPI-Host": "api-nba-v1.p.rapidapi.com"
         }
+        # Pooled keep-alive (HTTP/2 when available) client, shared by every request
         self.client = httpx.AsyncClient(
             base_url=self.BASE_URL,
             headers=self.headers,
-            timeout=30.0
+            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
         )
         # Current season is 2023-2024, so use "2023"
         self.current_season = "2023"
@@ -38,6 +42,10 @@ class APISportsService:
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client."""
         await self.client.aclose()
 
     async def _get_from_cache(self, session: AsyncSession, endpoint: str, params: Dict) -> Optional[Dict]:
@@ -302,8 +310,22 @@ class APISportsService:
             logger.error(f"Error fetching seasons info: {str(e)}")
             return {"error": str(e)}
 
-# Helper function to create a service instance
+@functools.lru_cache(maxsize=1)
+def get_shared_api_service() -> APISportsService:
+    """
+    Process-wide APISportsService, so every request reuses one pooled
+    connection to API-Sports instead of opening a fresh client.
+    """
+    return APISportsService()
+
+
+async def close_api_service() -> None:
+    """Close the shared service's client (app shutdown)."""
+    if get_shared_api_service.cache_info().currsize:
+        await get_shared_api_service().aclose()
+        get_shared_api_service.cache_clear()
+
+
+# FastAPI dependency returning the shared service instance
 async def get_api_service() -> APISportsService:
-    service = APISportsService()
-    yield service
-    await service.client.aclose() 
\ No newline at end of file
+    yield get_shared_api_service()
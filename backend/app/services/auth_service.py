@@ -13,8 +13,8 @@ import os
 from app.schemas.auth import UserCreate, UserLogin, GoogleOAuthRequest, AuthResponse, Token, UserResponse
 from app.repositories.user_repository import UserRepository
 from app.utils.auth import (
-    hash_password,
-    verify_password,
+    ahash_password,
+    averify_password,
     create_access_token,
     validate_password_strength,
 )
@@ -58,7 +58,7 @@ class AuthService:
             )
 
         # Hash password
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await ahash_password(user_data.password)
 
         # Create user
         user = await self.user_repo.create_user(user_data, hashed_password)
@@ -103,7 +103,7 @@ class AuthService:
             )
 
         # Verify password
-        if not user.hashed_password or not verify_password(credentials.password, user.hashed_password):
+        if not user.hashed_password or not await averify_password(credentials.password, user.hashed_password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
@@ -10,11 +10,12 @@ from datetime import datetime, date
 from typing import List, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
-from sqlalchemy import select
+from sqlalchemy import select, update
 
-from app.db.models import Team, Player, Game, PlayerGameStats
+from app.db.models import Team, Player, Game, PlayerGameStats, PlayerMetrics
 from app.services.balldontlie_client import BallDontLieClient
 from app.services.player_images import get_player_image_url
+from app.services.metrics_service import averages_query
 
 logger = logging.getLogger(__name__)
 
@@ -252,6 +253,7 @@ class IngestionService:
         count = 0
         player_map = self._get_player_id_mapping()
         game_map = self._get_game_id_mapping()
+        touched_player_ids = set()
 
         for stat_data in stats_data:
             # Map API IDs to internal IDs
@@ -314,14 +316,60 @@ class IngestionService:
             )
 
             self.db.execute(stmt)
+            touched_player_ids.add(internal_player_id)
             count += 1
 
             if count % 500 == 0:
                 logger.info(f"Processed {count} stat records...")
                 self.db.commit()
 
+        # Bump the stats version so cached averages for these players are recomputed
+        if touched_player_ids:
+            self.db.execute(
+                update(Player)
+                .where(Player.id.in_(touched_player_ids))
+                .values(stats_updated_at=datetime.utcnow())
+            )
+
         self.db.commit()
         logger.info(f"Stats ingestion complete: {count} stat records upserted")
+
+        if touched_player_ids:
+            self.refresh_player_metrics(list(touched_player_ids))
+
+        return count
+
+    def refresh_player_metrics(self, player_ids: Optional[List[int]] = None) -> int:
+        """
+        Recompute materialized season/last-5/last-10 averages in a single SQL statement.
+
+        Upserts the rows of metrics_service.averages_query into player_metrics,
+        so reads become a row lookup.
+
+        Args:
+            player_ids: Optional internal player IDs to refresh (default: all players)
+
+        Returns:
+            Number of players refreshed
+        """
+        logger.info(f"Refreshing player metrics (player_ids={len(player_ids) if player_ids else 'all'})")
+
+        summary = averages_query(player_ids)
+        columns = [column.name for column in summary.selected_columns]
+
+        stmt = sqlite_insert(PlayerMetrics).from_select(columns, summary)
+        set_ = {column: stmt.excluded[column] for column in columns[1:]}
+        set_['updated_at'] = datetime.utcnow()
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['player_id'],
+            set_=set_
+        )
+
+        result = self.db.execute(stmt)
+        self.db.commit()
+
+        count = result.rowcount
+        logger.info(f"Player metrics refresh complete: {count} players refreshed")
         return count
 
     # ===== Helper Methods =====
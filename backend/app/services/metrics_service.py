@@ -1,8 +1,99 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+from collections import OrderedDict
 from datetime import datetime, timedelta
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from ..db.models import Player, PlayerGameStats, SportsbookLine, Game
+from sqlalchemy import select, and_, or_, func, case
+from ..db.models import Player, PlayerGameStats, PlayerMetrics, SportsbookLine, Game
+
+MARKETS = ('points', 'rebounds', 'assists', 'pra')
+
+WINDOWS = (('season', None), ('last5', 5), ('last10', 10))
+
+# In-process LRU of per-player averages keyed by (player_id, stats_updated_at).
+# Ingestion bumps Player.stats_updated_at, so new games naturally miss the cache;
+# the TTL bounds how long a season rollover can go unnoticed.
+_averages_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+AVERAGES_CACHE_DURATION = timedelta(hours=1)
+AVERAGES_CACHE_MAXSIZE = 1024
+
+
+def season_bounds(season: str) -> Optional[Tuple[datetime, datetime]]:
+    """Half-open [start, end) dates of a season label like "2024-25", October through June."""
+    try:
+        start_year = int(season[:4])
+    except (TypeError, ValueError):
+        return None
+    if season != f"{start_year}-{(start_year + 1) % 100:02d}":
+        return None
+    return datetime(start_year, 10, 1), datetime(start_year + 1, 7, 1)
+
+
+def current_season(now: Optional[datetime] = None) -> str:
+    """Season label in play on a date; the off-season maps to the season just finished."""
+    now = now or datetime.utcnow()
+    start_year = now.year if now.month >= 10 else now.year - 1
+    return f"{start_year}-{(start_year + 1) % 100:02d}"
+
+
+def average_or_none(value) -> Optional[float]:
+    """A stored average as a float, or None when it is missing (SQL NULL arrives as None or NaN)."""
+    if value is None or np.isnan(value):
+        return None
+    return float(value)
+
+
+def _market_value(stats, market: str):
+    """SQL expression for a market's per-game value, or None for unknown markets."""
+    if market == 'pra':
+        return stats.c.points + stats.c.rebounds + stats.c.assists
+    if market in ('points', 'rebounds', 'assists'):
+        return stats.c[market]
+    return None
+
+
+def averages_query(player_ids: Optional[List[int]] = None, season: Optional[str] = None):
+    """
+    Build a SELECT returning one row of averages per player, aggregated in SQL.
+
+    Games are ranked newest-first with ROW_NUMBER() so every window is a
+    conditional AVG over the same scan. The season window only counts games
+    inside the season (default: current_season()); last5/last10 are the most
+    recent games regardless of season. Columns are player_id, games_played
+    (games this season), then "{window}_{market}" for each of WINDOWS x MARKETS.
+    """
+    bounds = season_bounds(season or current_season())
+    if bounds is None:
+        raise ValueError(f"Unknown season: {season}")
+    season_start, season_end = bounds
+
+    ranked = select(
+        PlayerGameStats.player_id,
+        PlayerGameStats.date,
+        PlayerGameStats.points,
+        PlayerGameStats.rebounds,
+        PlayerGameStats.assists,
+        func.row_number().over(
+            partition_by=PlayerGameStats.player_id,
+            order_by=PlayerGameStats.date.desc()
+        ).label('rn')
+    )
+    if player_ids:
+        ranked = ranked.where(PlayerGameStats.player_id.in_(player_ids))
+    ranked = ranked.subquery()
+
+    in_season = and_(ranked.c.date >= season_start, ranked.c.date < season_end)
+    aggregates = [ranked.c.player_id, func.count(case((in_season, 1))).label('games_played')]
+    for window, last_n in WINDOWS:
+        for market in MARKETS:
+            value = _market_value(ranked, market)
+            if last_n is None:
+                value = case((in_season, value))
+            else:
+                value = case((ranked.c.rn <= last_n, value))
+            aggregates.append(func.avg(value).label(f"{window}_{market}"))
+
+    return select(*aggregates).group_by(ranked.c.player_id)
 
 
 class MetricsService:
@@ -27,31 +118,20 @@ class MetricsService:
         Returns:
             Rolling average or None if insufficient data
         """
-        query = (
-            select(PlayerGameStats)
+        recent = (
+            select(PlayerGameStats.points, PlayerGameStats.rebounds, PlayerGameStats.assists)
             .where(PlayerGameStats.player_id == player_id)
             .order_by(PlayerGameStats.date.desc())
             .limit(last_n_games)
+            .subquery()
         )
 
-        result = await db.execute(query)
-        stats = result.scalars().all()
-
-        if not stats:
-            return None
-
-        if market == 'points':
-            values = [s.points for s in stats]
-        elif market == 'rebounds':
-            values = [s.rebounds for s in stats]
-        elif market == 'assists':
-            values = [s.assists for s in stats]
-        elif market == 'pra':
-            values = [s.points + s.rebounds + s.assists for s in stats]
-        else:
+        value = _market_value(recent, market)
+        if value is None:
             return None
 
-        return sum(values) / len(values) if values else None
+        result = await db.execute(select(func.avg(value)))
+        return result.scalar()
 
     @staticmethod
     async def compute_season_average(
@@ -70,31 +150,135 @@ class MetricsService:
             season: Season year (e.g., "2024-25")
 
         Returns:
-            Season average or None if no data
+            Season average or None if no data or the season is unknown
         """
-        query = (
-            select(PlayerGameStats)
-            .where(PlayerGameStats.player_id == player_id)
-        )
+        stats = PlayerGameStats.__table__
+        value = _market_value(stats, market)
+        if value is None:
+            return None
+
+        bounds = season_bounds(season)
+        if bounds is None:
+            return None
+        season_start, season_end = bounds
 
+        query = select(func.avg(value)).where(
+            stats.c.player_id == player_id,
+            stats.c.date >= season_start,
+            stats.c.date < season_end,
+        )
         result = await db.execute(query)
-        stats = result.scalars().all()
+        return result.scalar()
 
-        if not stats:
-            return None
+    @staticmethod
+    async def get_market_averages(
+        db: AsyncSession,
+        player_id: int
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Get season/last5/last10 averages for every market.
 
-        if market == 'points':
-            values = [s.points for s in stats]
-        elif market == 'rebounds':
-            values = [s.rebounds for s in stats]
-        elif market == 'assists':
-            values = [s.assists for s in stats]
-        elif market == 'pra':
-            values = [s.points + s.rebounds + s.assists for s in stats]
-        else:
-            return None
+        Args:
+            db: Database session
+            player_id: Player ID
+
+        Returns:
+            Dict of window name -> array of averages ordered like MARKETS,
+            or None if the player has no game stats
+        """
+        averages = await MetricsService.get_players_market_averages(db, [player_id])
+        return averages.get(player_id)
+
+    @staticmethod
+    async def get_players_market_averages(
+        db: AsyncSession,
+        player_ids: List[int]
+    ) -> Dict[int, Optional[Dict[str, np.ndarray]]]:
+        """
+        Get market averages for many players.
+
+        Serves players from the in-process cache while their stats version
+        (Player.stats_updated_at) is unchanged. The rest read materialized
+        PlayerMetrics rows, which only count if refreshed after the player's
+        stats last changed; players without a fresh row are aggregated in SQL
+        with one query.
+
+        Args:
+            db: Database session
+            player_ids: Player IDs
 
-        return sum(values) / len(values) if values else None
+        Returns:
+            Dict of player ID -> averages (see get_market_averages)
+        """
+        if not player_ids:
+            return {}
+
+        # One primary-key read for the stats versions; unchanged players skip
+        # both the metrics read and the aggregate
+        version_query = select(Player.id, Player.stats_updated_at).where(Player.id.in_(player_ids))
+        versions = {pid: version for pid, version in (await db.execute(version_query)).all()}
+
+        # Only cache versioned players; rows written outside ingestion carry no version
+        now = datetime.utcnow()
+        averages_by_player = {}
+        remaining = []
+        for pid in player_ids:
+            key = (pid, versions.get(pid))
+            cached = _averages_cache.get(key) if key[1] else None
+            if cached and cached[0] > now:
+                _averages_cache.move_to_end(key)
+                averages_by_player[pid] = cached[1]
+            else:
+                remaining.append(pid)
+
+        if not remaining:
+            return averages_by_player
+
+        # Materialized metrics written by ingestion are a plain row lookup,
+        # skipped when stats were written after the last refresh
+        metrics_query = (
+            select(PlayerMetrics)
+            .join(Player, Player.id == PlayerMetrics.player_id)
+            .where(
+                PlayerMetrics.player_id.in_(remaining),
+                or_(
+                    Player.stats_updated_at.is_(None),
+                    PlayerMetrics.updated_at >= Player.stats_updated_at,
+                ),
+            )
+        )
+        metrics_result = await db.execute(metrics_query)
+        for m in metrics_result.scalars().all():
+            averages_by_player[m.player_id] = {
+                window: np.array([getattr(m, f"{window}_{market}") for market in MARKETS], dtype=np.float64)
+                for window, _ in WINDOWS
+            }
+        misses = [pid for pid in remaining if pid not in averages_by_player]
+
+        if misses:
+            # Aggregate every miss in the database; only one row per player comes back
+            summary_result = await db.execute(averages_query(misses))
+            summaries = {row.player_id: row for row in summary_result.all()}
+
+            for pid in misses:
+                row = summaries.get(pid)
+                averages = None
+                if row is not None:
+                    averages = {
+                        window: np.array([row._mapping[f"{window}_{market}"] for market in MARKETS], dtype=np.float64)
+                        for window, _ in WINDOWS
+                    }
+                averages_by_player[pid] = averages
+
+        for pid in remaining:
+            key = (pid, versions.get(pid))
+            if key[1]:
+                _averages_cache[key] = (now + AVERAGES_CACHE_DURATION, averages_by_player[pid])
+                _averages_cache.move_to_end(key)
+                if len(_averages_cache) > AVERAGES_CACHE_MAXSIZE:
+                    _averages_cache.popitem(last=False)
+
+        return averages_by_player
 
     @staticmethod
     async def get_player_markets_data(
@@ -113,57 +297,107 @@ class MetricsService:
         Returns:
             List of market data dictionaries
         """
-        markets_data = []
-        markets = ['points', 'rebounds', 'assists', 'pra']
-
-        for market in markets:
-            # Get sportsbook line
-            line_query = (
-                select(SportsbookLine)
-                .where(
-                    and_(
-                        SportsbookLine.player_id == player_id,
-                        SportsbookLine.market == market,
-                        SportsbookLine.date >= date.replace(hour=0, minute=0, second=0),
-                        SportsbookLine.date < date.replace(hour=23, minute=59, second=59)
-                    )
+        markets_data = await MetricsService.get_players_markets_data(db, [player_id], date)
+        return markets_data.get(player_id, [])
+
+    @staticmethod
+    async def get_players_markets_data(
+        db: AsyncSession,
+        player_ids: List[int],
+        date: datetime
+    ) -> Dict[int, List[Dict]]:
+        """
+        Get market data for many players at once, e.g. for a full daily slate.
+
+        Args:
+            db: Database session
+            player_ids: Player IDs
+            date: Date for sportsbook lines
+
+        Returns:
+            Dict of player ID -> list of market data dictionaries
+        """
+        markets = MARKETS
+        day_start = date.replace(hour=0, minute=0, second=0, microsecond=0)
+        day_end = day_start + timedelta(days=1)
+
+        # Fetch every line for these players/day in one query
+        line_query = (
+            select(SportsbookLine)
+            .where(
+                and_(
+                    SportsbookLine.player_id.in_(player_ids),
+                    SportsbookLine.market.in_(markets),
+                    SportsbookLine.date >= day_start,
+                    SportsbookLine.date < day_end
                 )
             )
-            line_result = await db.execute(line_query)
-            line = line_result.scalar_one_or_none()
+        )
+        line_result = await db.execute(line_query)
+        lines_by_player = {}
+        for line in line_result.scalars().all():
+            lines_by_player.setdefault(line.player_id, {})[line.market] = line
+
+        averages_by_player = await MetricsService.get_players_market_averages(
+            db, list(lines_by_player)
+        )
+
+        markets_by_player = {}
+        for player_id in player_ids:
+            lines_by_market = lines_by_player.get(player_id)
+            if not lines_by_market:
+                markets_by_player[player_id] = []
+                continue
+
+            markets_by_player[player_id] = MetricsService._build_markets_data(
+                lines_by_market, averages_by_player.get(player_id)
+            )
+
+        return markets_by_player
+
+    @staticmethod
+    def _build_markets_data(
+        lines_by_market: Dict[str, SportsbookLine],
+        averages: Optional[Dict[str, np.ndarray]]
+    ) -> List[Dict]:
+        """Combine a player's lines with their averages into market data dictionaries."""
+        markets_data = []
+
+        for i, market in enumerate(MARKETS):
+            line = lines_by_market.get(market)
 
             if not line:
                 continue
 
-            # Compute averages
-            season_avg = await MetricsService.compute_season_average(db, player_id, market)
-            last5_avg = await MetricsService.compute_rolling_averages(db, player_id, market, 5)
-            last10_avg = await MetricsService.compute_rolling_averages(db, player_id, market, 10)
+            # Look up averages; a window with no games is NaN in the array
+            season_avg = average_or_none(averages['season'][i]) if averages else None
+            last5_avg = average_or_none(averages['last5'][i]) if averages else None
+            last10_avg = average_or_none(averages['last10'][i]) if averages else None
 
             # Compute deltas
-            delta_line_vs_season = line.line_value - season_avg if season_avg else None
-            delta_line_vs_last5 = line.line_value - last5_avg if last5_avg else None
+            delta_line_vs_season = line.line_value - season_avg if season_avg is not None else None
+            delta_line_vs_last5 = line.line_value - last5_avg if last5_avg is not None else None
 
             pct_diff_line_vs_season = None
             pct_diff_line_vs_last5 = None
 
-            if season_avg and season_avg != 0:
+            if season_avg is not None and season_avg != 0:
                 pct_diff_line_vs_season = ((line.line_value - season_avg) / season_avg) * 100
 
-            if last5_avg and last5_avg != 0:
+            if last5_avg is not None and last5_avg != 0:
                 pct_diff_line_vs_last5 = ((line.line_value - last5_avg) / last5_avg) * 100
 
             markets_data.append({
                 'market': market,
                 'line_value': line.line_value,
                 'book': line.book,
-                'season_avg': round(season_avg, 1) if season_avg else None,
-                'last5_avg': round(last5_avg, 1) if last5_avg else None,
-                'last10_avg': round(last10_avg, 1) if last10_avg else None,
-                'delta_line_vs_season': round(delta_line_vs_season, 1) if delta_line_vs_season else None,
-                'delta_line_vs_last5': round(delta_line_vs_last5, 1) if delta_line_vs_last5 else None,
-                'pct_diff_line_vs_season': round(pct_diff_line_vs_season, 1) if pct_diff_line_vs_season else None,
-                'pct_diff_line_vs_last5': round(pct_diff_line_vs_last5, 1) if pct_diff_line_vs_last5 else None,
+                'season_avg': round(season_avg, 1) if season_avg is not None else None,
+                'last5_avg': round(last5_avg, 1) if last5_avg is not None else None,
+                'last10_avg': round(last10_avg, 1) if last10_avg is not None else None,
+                'delta_line_vs_season': round(delta_line_vs_season, 1) if delta_line_vs_season is not None else None,
+                'delta_line_vs_last5': round(delta_line_vs_last5, 1) if delta_line_vs_last5 is not None else None,
+                'pct_diff_line_vs_season': round(pct_diff_line_vs_season, 1) if pct_diff_line_vs_season is not None else None,
+                'pct_diff_line_vs_last5': round(pct_diff_line_vs_last5, 1) if pct_diff_line_vs_last5 is not None else None,
             })
 
         return markets_data
@@ -185,8 +419,18 @@ class MetricsService:
         Returns:
             List of game log dictionaries
         """
+        # Select scalar columns to skip ORM hydration; the date is formatted
+        # in Python because SQL date formatting differs per dialect
         query = (
-            select(PlayerGameStats, Game)
+            select(
+                PlayerGameStats.date,
+                PlayerGameStats.points,
+                PlayerGameStats.rebounds,
+                PlayerGameStats.assists,
+                PlayerGameStats.minutes,
+                Game.home_team,
+                Game.away_team,
+            )
             .join(Game, PlayerGameStats.game_id == Game.id)
             .where(PlayerGameStats.player_id == player_id)
             .order_by(PlayerGameStats.date.desc())
@@ -194,18 +438,17 @@ class MetricsService:
         )
 
         result = await db.execute(query)
-        rows = result.all()
 
         game_logs = []
-        for stat, game in rows:
+        for date, points, rebounds, assists, minutes, home_team, away_team in result.all():
             game_logs.append({
-                'date': stat.date.strftime('%Y-%m-%d'),
-                'opponent': game.away_team if game.home_team else game.home_team,  # Simplified
-                'points': stat.points,
-                'rebounds': stat.rebounds,
-                'assists': stat.assists,
-                'minutes': stat.minutes,
-                'pra': stat.points + stat.rebounds + stat.assists,
+                'date': date.strftime('%Y-%m-%d'),
+                'opponent': away_team if home_team else home_team,  # Simplified
+                'points': points,
+                'rebounds': rebounds,
+                'assists': assists,
+                'minutes': minutes,
+                'pra': points + rebounds + assists,
             })
 
         return game_logs
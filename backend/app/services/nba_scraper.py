@@ -10,6 +10,9 @@ from ..config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# lxml's C parser is several times faster than the pure-Python html.parser
+HTML_PARSER = "lxml"
+
 class NBAScraper:
     def __init__(self):
         self.base_url = "https://www.nba.com/stats"
@@ -19,31 +22,53 @@ class NBAScraper:
         self.settings = get_settings()
         self.delay = self.settings.SCRAPING_DELAY
         self.max_retries = self.settings.MAX_RETRIES
-
-    async def _make_request(self, url: str, retry_count: int = 0) -> Optional[str]:
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared client session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=10, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared client session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _make_request(self, url: str) -> Optional[str]:
         """Make a request with retry logic and rate limiting"""
-        if retry_count >= self.max_retries:
-            logger.error(f"Max retries reached for URL: {url}")
-            return None
-
-        try:
-            async with aiohttp.ClientSession(headers=self.headers) as session:
-                await asyncio.sleep(self.delay)  # Rate limiting
+        session = await self._get_session()
+        await asyncio.sleep(self.delay)  # Rate limiting
+
+        for attempt in range(self.max_retries):
+            # No point waiting after the final attempt
+            last_attempt = attempt == self.max_retries - 1
+            backoff = self.delay * 2 ** attempt
+            try:
                 async with session.get(url) as response:
                     if response.status == 200:
                         return await response.text()
                     elif response.status == 429:  # Too Many Requests
-                        wait_time = int(response.headers.get('Retry-After', self.delay * 2))
-                        logger.warning(f"Rate limited. Waiting {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                        return await self._make_request(url, retry_count + 1)
+                        wait_time = int(response.headers.get('Retry-After', backoff))
                     else:
                         logger.error(f"Request failed with status {response.status} for URL: {url}")
                         return None
-        except Exception as e:
-            logger.error(f"Error making request to {url}: {str(e)}")
-            await asyncio.sleep(self.delay * 2)
-            return await self._make_request(url, retry_count + 1)
+
+                if last_attempt:
+                    break
+                logger.warning(f"Rate limited. Waiting {wait_time} seconds...")
+                await asyncio.sleep(max(wait_time, 0))
+            except Exception as e:
+                logger.error(f"Error making request to {url}: {str(e)}")
+                if not last_attempt:
+                    await asyncio.sleep(backoff)
+
+        logger.error(f"Max retries reached for URL: {url}")
+        return None
 
     async def get_player_stats(self, player_id: str) -> Optional[Dict]:
         """Get detailed player statistics from NBA.com"""
@@ -53,7 +78,7 @@ class NBAScraper:
             return None
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
             # Extract player stats from the page
             # Note: This is a basic implementation. You'll need to adjust selectors based on actual page structure
             stats = {
@@ -74,7 +99,7 @@ class NBAScraper:
             return None
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
             # Extract team stats from the page
             stats = {
                 "team_stats": self._extract_team_stats(soup),
@@ -126,7 +151,7 @@ class NBAScraper:
             return None
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
             return self._extract_game_log(soup)
         except Exception as e:
             logger.error(f"Error parsing player game log: {str(e)}")
@@ -142,7 +167,7 @@ class NBAScraper:
             return None
 
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            soup = BeautifulSoup(html, HTML_PARSER)
             return self._extract_team_schedule(soup)
         except Exception as e:
             logger.error(f"Error parsing team game log: {str(e)}")
@@ -1,16 +1,32 @@
-import json
+import orjson
 import asyncio
+import logging
 import websockets
-from typing import Optional, Dict, Any, Callable
+from typing import Optional, Dict, Any, Callable, List
 from datetime import datetime
 
+logger = logging.getLogger(__name__)
+
 class NBAGameService:
-    def __init__(self, api_key: str, base_url: str = "wss://api.geniussports.com/nbangss/stream"):
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = "wss://api.geniussports.com/nbangss/stream",
+        queue_size: int = 1024,
+        num_workers: int = 1,
+    ):
         self.api_key = api_key
         self.base_url = base_url
         self.websocket: Optional[websockets.WebSocketClientProtocol] = None
         self.message_handlers: Dict[str, Callable] = {}
         self._running = False
+        # Decoded messages wait here so slow handlers never stall the socket reader.
+        # One queue per worker; each game is pinned to one queue so its updates
+        # are handled in the order they arrived.
+        self._queues: List[asyncio.Queue] = [
+            asyncio.Queue(maxsize=queue_size) for _ in range(max(num_workers, 1))
+        ]
+        self._tasks: List[asyncio.Task] = []
 
     async def connect(self, game_id: Optional[str] = None, message_types: str = "sc,ev,gi,te"):
         """Connect to the NBA Game Distribution API WebSocket"""
@@ -25,28 +41,57 @@ class NBAGameService:
             "type": "authentication",
             "apikey": self.api_key
         }
-        await self.websocket.send(json.dumps(auth_message))
+        await self.websocket.send(orjson.dumps(auth_message).decode())
         
-        # Start listening for messages
+        # Start listening for messages and the workers that dispatch them
+        self._start_tasks()
+
+    def _start_tasks(self):
+        """Start the socket reader and one dispatch worker per queue"""
         self._running = True
-        asyncio.create_task(self._listen_for_messages())
+        self._tasks = [asyncio.create_task(self._listen_for_messages())]
+        self._tasks.extend(
+            asyncio.create_task(self._process_messages(queue)) for queue in self._queues
+        )
 
     async def _listen_for_messages(self):
-        """Listen for incoming WebSocket messages"""
+        """Listen for incoming WebSocket messages and queue them for the workers"""
         try:
             while self._running and self.websocket:
                 message = await self.websocket.recv()
-                data = json.loads(message)
+                data = orjson.loads(message)
                 
-                # Handle the message based on its type
-                message_type = data.get("type")
-                if message_type in self.message_handlers:
-                    await self.message_handlers[message_type](data)
+                # Only queue messages someone will handle; drop the oldest when full
+                if data.get("type") not in self.message_handlers:
+                    continue
+                queue = self._queues[hash(data.get("gameId")) % len(self._queues)]
+                if queue.full():
+                    dropped = queue.get_nowait()
+                    queue.task_done()
+                    logger.warning(
+                        f"Message queue full; dropped oldest {dropped.get('type')} message "
+                        f"for game {dropped.get('gameId')}"
+                    )
+                queue.put_nowait(data)
+                # recv() can return buffered frames without suspending; yield to the workers
+                await asyncio.sleep(0)
         except websockets.exceptions.ConnectionClosed:
             print("WebSocket connection closed")
         except Exception as e:
             print(f"Error in WebSocket listener: {e}")
 
+    async def _process_messages(self, queue: asyncio.Queue):
+        """Dispatch one queue's messages to their handlers, in order"""
+        while True:
+            data = await queue.get()
+            try:
+                # Handle the message based on its type
+                await self.message_handlers[data["type"]](data)
+            except Exception as e:
+                print(f"Error handling {data.get('type')} message: {e}")
+            finally:
+                queue.task_done()
+
     def register_handler(self, message_type: str, handler: Callable):
         """Register a handler for a specific message type"""
         self.message_handlers[message_type] = handler
@@ -54,6 +99,9 @@ class NBAGameService:
     async def disconnect(self):
         """Disconnect from the WebSocket"""
         self._running = False
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
         if self.websocket:
             await self.websocket.close()
             self.websocket = None
@@ -69,7 +117,7 @@ class NBAGameService:
             "requestType": "gi",
             "gameId": game_id
         }
-        await self.websocket.send(json.dumps(request))
+        await self.websocket.send(orjson.dumps(request).decode())
         
         # Wait for response (implementation depends on your needs)
         # This is a simplified version
@@ -86,7 +134,7 @@ class NBAGameService:
             "requestType": "te",
             "gameId": game_id
         }
-        await self.websocket.send(json.dumps(request))
+        await self.websocket.send(orjson.dumps(request).decode())
         
         # Wait for response (implementation depends on your needs)
         # This is a simplified version
@@ -8,6 +8,13 @@ with the NBA CDN - this is free, legal, and used by ESPN and official NBA sites.
 
 from typing import Optional
 
+_CDN_BASE = "https://cdn.nba.com/headshots/nba/latest/"
+
+# Precomputed URL prefixes for the sizes we actually request
+_FULL_PREFIX = _CDN_BASE + "1040x760/"
+_THUMB_PREFIX = _CDN_BASE + "260x190/"
+_SIZE_PREFIXES = {"1040x760": _FULL_PREFIX, "260x190": _THUMB_PREFIX}
+
 
 def get_nba_headshot_url(player_id: int, size: str = "1040x760") -> str:
     """
@@ -27,7 +34,8 @@ def get_nba_headshot_url(player_id: int, size: str = "1040x760") -> str:
         >>> get_nba_headshot_url(2544)  # LeBron James
         'https://cdn.nba.com/headshots/nba/latest/1040x760/2544.png'
     """
-    return f"https://cdn.nba.com/headshots/nba/latest/{size}/{player_id}.png"
+    prefix = _SIZE_PREFIXES.get(size) or _CDN_BASE + size + "/"
+    return prefix + str(player_id) + ".png"
 
 
 def get_nba_thumbnail_url(player_id: int) -> str:
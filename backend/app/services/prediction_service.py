@@ -1,5 +1,7 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Union
 import numpy as np
+import pandas as pd
+from numpy.lib.recfunctions import structured_to_unstructured
 from datetime import datetime, timedelta
 import logging
 from ..models.data_prep import DataPreprocessor
@@ -7,6 +9,18 @@ from ..models.ensemble import EnsemblePredictor
 
 logger = logging.getLogger(__name__)
 
+# Per-game stat fields, in API-Sports naming, that make up a game line
+GAME_STAT_COLUMNS = [
+    "points", "assists", "rebounds", "minutes",
+    "fieldGoalsMade", "fieldGoalsAttempted",
+    "threePointersMade", "threePointersAttempted",
+    "freeThrowsMade", "freeThrowsAttempted",
+    "offensiveRebounds", "defensiveRebounds",
+    "steals", "blocks", "turnovers", "fouls",
+]
+# Built once so every game-line frame shares the same column index
+GAME_STAT_INDEX = pd.Index(GAME_STAT_COLUMNS)
+
 class PredictionService:
     def __init__(self):
         self.preprocessor = DataPreprocessor()
@@ -55,6 +69,37 @@ class PredictionService:
             logger.error(f"Error generating predictions: {str(e)}")
             return self._get_default_predictions()
     
+    def _game_stats(self, games: Union[List[Dict], np.ndarray]) -> np.ndarray:
+        """
+        Fresh (games, GAME_STAT_COLUMNS) float32 array of game lines
+        Takes a list of game dicts (missing stats become NaN) or a structured array with a field for every column.
+        """
+        if isinstance(games, np.ndarray):
+            # Typed fields are read by name, with no per-record work
+            return structured_to_unstructured(games[GAME_STAT_COLUMNS], dtype=np.float32)
+        nan = float("nan")
+        return np.array(
+            [[game.get(column, nan) for column in GAME_STAT_COLUMNS] for game in games],
+            dtype=np.float32,
+        ).reshape(-1, len(GAME_STAT_COLUMNS))
+    
+    def _preprocess_data(self, games: Union[List[Dict], np.ndarray]) -> pd.DataFrame:
+        """
+        Build a float32 frame of game lines, one row per game, columns in GAME_STAT_COLUMNS order
+        The frame wraps the array from _game_stats without copying it.
+        """
+        return pd.DataFrame(self._game_stats(games), columns=GAME_STAT_INDEX, copy=False)
+    
+    def _normalize_data(self, games: Union[List[Dict], np.ndarray]) -> pd.DataFrame:
+        """
+        Min-max normalize game lines per column over the batch's own range, in float32
+        The math runs on the ndarray; the frame only wraps the result without copying.
+        """
+        values = self._game_stats(games)
+        # A separate preprocessor: self.preprocessor's fitted ranges cover the model features
+        DataPreprocessor().fit(values).transform_into(values, values)
+        return pd.DataFrame(values, columns=GAME_STAT_INDEX, copy=False)
+    
     def _calculate_confidence(self, recent_games: List[Dict]) -> float:
         """
         Calculate confidence score based on recent performance consistency
@@ -62,23 +107,18 @@ class PredictionService:
         if len(recent_games) < 3:
             return 0.5  # Default confidence for limited data
             
-        # Calculate standard deviation of key stats
-        points = [game.get("points", 0) for game in recent_games]
-        assists = [game.get("assists", 0) for game in recent_games]
-        rebounds = [game.get("totReb", 0) for game in recent_games]
+        # Stack points, assists, rebounds into a (G, 3) array and reduce once
+        stats = np.array(
+            [[game.get("points", 0), game.get("assists", 0), game.get("totReb", 0)] for game in recent_games],
+            dtype=np.float64,
+        )
         
         # Calculate consistency scores (lower std dev = higher consistency)
-        points_consistency = 1 - (np.std(points) / (np.mean(points) + 1e-6))
-        assists_consistency = 1 - (np.std(assists) / (np.mean(assists) + 1e-6))
-        rebounds_consistency = 1 - (np.std(rebounds) / (np.mean(rebounds) + 1e-6))
+        consistency = 1 - stats.std(axis=0) / (stats.mean(axis=0) + 1e-6)
         
         # Weight the consistency scores
-        weights = [0.5, 0.3, 0.2]  # Points, assists, rebounds weights
-        confidence = (
-            points_consistency * weights[0] +
-            assists_consistency * weights[1] +
-            rebounds_consistency * weights[2]
-        )
+        weights = np.array([0.5, 0.3, 0.2])  # Points, assists, rebounds weights
+        confidence = float(consistency @ weights)
         
         return min(max(confidence, 0.1), 0.95)  # Bound between 0.1 and 0.95
     
@@ -92,13 +132,19 @@ class PredictionService:
         # Calculate adjustment factors
         def_factor = opp_def_rating / 100  # >1 means tougher defense
         
-        # Apply adjustments
-        adjusted = base_prediction.copy()
-        adjusted[0][0] *= (1 / def_factor)  # Points
-        adjusted[0][1] *= (1 / def_factor)  # Assists
-        adjusted[0][2] *= (1 / def_factor)  # Rebounds
-        
-        return adjusted
+        # Apply adjustment to points, assists and rebounds in one multiply
+        return base_prediction * (1 / def_factor)
+    
+    def _validate_prediction_thresholds(self, predictions, thresholds) -> bool:
+        """
+        Check that every predicted stat meets its threshold
+        Takes {stat: value} dicts (compared on the thresholds' stats) or two aligned arrays.
+        """
+        if isinstance(thresholds, dict):
+            stats = list(thresholds)
+            predictions = np.fromiter((predictions[stat] for stat in stats), dtype=np.float64, count=len(stats))
+            thresholds = np.fromiter(thresholds.values(), dtype=np.float64, count=len(stats))
+        return bool((np.asarray(predictions) >= np.asarray(thresholds)).all())
     
     def _get_default_predictions(self) -> Dict:
         """
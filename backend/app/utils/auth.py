@@ -3,8 +3,12 @@ Authentication utilities for JWT token handling and password hashing
 """
 from datetime import datetime, timedelta
 from typing import Optional
+import asyncio
 import os
+import threading
+import time
 
+from cachetools import TTLCache
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
@@ -24,6 +28,11 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 # Security scheme
 security = HTTPBearer()
 
+# Decoded token payloads, keyed by token string. Tokens are immutable so
+# nothing needs invalidating; the TTL just bounds memory.
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+_token_cache_lock = threading.Lock()
+
 
 def hash_password(password: str) -> str:
     """Hash a password using bcrypt"""
@@ -35,6 +44,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+async def ahash_password(password: str) -> str:
+    """Hash a password in a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(None, pwd_context.hash, password)
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        None, pwd_context.verify, plain_password, hashed_password
+    )
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token
@@ -72,9 +93,15 @@ def decode_access_token(token: str) -> dict:
     Raises:
         HTTPException: If token is invalid or expired
     """
+    with _token_cache_lock:
+        payload = _token_cache.get(token)
+
+    # A cached payload can outlive the token it came from, so re-check expiry
+    if payload is not None and payload.get("exp", float("inf")) > time.time():
+        return payload
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,6 +109,10 @@ def decode_access_token(token: str) -> dict:
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    with _token_cache_lock:
+        _token_cache[token] = payload
+    return payload
+
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -149,10 +180,20 @@ def validate_password_strength(password: str) -> bool:
     if len(password) < 8:
         raise ValueError("Password must be at least 8 characters long")
 
-    if not any(char.isupper() for char in password):
+    # Single pass over the password: bit 1 = uppercase seen, bit 2 = digit seen
+    flags = 0
+    for char in password:
+        if char.isupper():
+            flags |= 1
+        elif char.isdigit():
+            flags |= 2
+        if flags == 3:
+            break
+
+    if not flags & 1:
         raise ValueError("Password must contain at least one uppercase letter")
 
-    if not any(char.isdigit() for char in password):
+    if not flags & 2:
         raise ValueError("Password must contain at least one number")
 
     return True
@@ -1,12 +1,43 @@
 import os
-import requests
+import asyncio
+import functools
 import logging
-from typing import Dict, Optional, List
+import threading
+from typing import Dict, Iterable, Optional, List, Tuple
 from datetime import datetime, timedelta
-import json
+import orjson
+
+import aiohttp
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from requests_cache import CachedSession
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Query for the full NBA slate; every player lookup is served from this one response
+SLATE_PARAMS = {
+    'regions': 'us',
+    'markets': 'player_props',
+    'oddsFormat': 'american'
+}
+SLATE_CACHE_KEY = tuple(SLATE_PARAMS.values())
+
+# On-disk HTTP cache so repeat runs within the TTL don't hit the API again.
+# Defaults to the backend directory, whatever directory the process starts in.
+ODDS_CACHE_PATH = os.getenv(
+    'ODDS_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), '.odds_cache.sqlite')
+)
+ODDS_CACHE_EXPIRE_SECONDS = 60
+
+# Recommendation indexed by whether the prediction beats the line
+RECOMMENDATIONS = ('under', 'over')
+
+# Outbound request budget, kept just under the provider's 5 req/s to absorb clock skew
+ODDS_API_MAX_RATE = 4.5
+
 class OddsAPI:
     def __init__(self):
         self.api_key = os.getenv('ODDS_API_KEY')
@@ -18,59 +49,225 @@ class OddsAPI:
             'x-api-key': self.api_key
         }
         
+        # Persistent session so repeated lookups reuse pooled connections. GETs are
+        # cached on disk, and the last good response is served if the API errors.
+        self.session = CachedSession(
+            ODDS_CACHE_PATH,
+            backend='sqlite',
+            expire_after=ODDS_CACHE_EXPIRE_SECONDS,
+            allowable_methods=('GET',),
+            stale_if_error=True
+        )
+        self.session.headers.update(self.headers)
+        retry = Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            raise_on_status=False
+        )
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10, max_retries=retry))
+        
+        # The slate is the same for every player, so fetch it at most once a minute
+        self._cache = TTLCache(maxsize=16, ttl=60)
+        self._cache_lock = threading.Lock()
+        # Held while a sync slate fetch is in flight so concurrent threads share it
+        self._fetch_lock = threading.Lock()
+        
+        # Async client, created on first use; concurrent misses share one in-flight fetch
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+        self._limiter = AsyncLimiter(ODDS_API_MAX_RATE, 1)
+        
+        # Validator and body of the last async slate download, for conditional GETs
+        self._etag: Optional[str] = None
+        self._last_games: Optional[List[Dict]] = None
+        
+        # Slate the cached index was built from, so an unchanged slate isn't reindexed
+        self._indexed: Optional[Tuple[List[Dict], Dict[str, List[Dict]]]] = None
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared client session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=10)
+            )
+        return self._session
+        
+    async def close(self):
+        """Close the shared client session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        
+    def _fetch_index(self) -> Optional[Dict[str, List[Dict]]]:
+        """
+        Download the slate and parse it into the player -> props index
+        requests-cache stores the body whole, so it is decoded in one orjson call
+        """
+        response = self.session.get(self.base_url, params=SLATE_PARAMS)
+        
+        if response.status_code != 200:
+            logger.error(f"Odds API error: {response.text}")
+            return None
+        
+        return self._index_games(orjson.loads(response.content))
+        
+    async def _afetch_games(self) -> Optional[List[Dict]]:
+        """
+        Get all NBA games with odds, served from the TTL cache when fresh
+        Concurrent callers on a cache miss await the same request instead of each hitting the API
+        """
+        with self._cache_lock:
+            games = self._cache.get(SLATE_CACHE_KEY)
+        if games is not None:
+            return games
+        
+        task = self._inflight.get(SLATE_CACHE_KEY)
+        if task is None:
+            task = asyncio.ensure_future(self._request_games())
+            self._inflight[SLATE_CACHE_KEY] = task
+            task.add_done_callback(lambda _: self._inflight.pop(SLATE_CACHE_KEY, None))
+        
+        # Shield so one cancelled caller doesn't cancel the fetch for the others
+        return await asyncio.shield(task)
+        
+    async def _request_games(self) -> Optional[List[Dict]]:
+        """
+        Fetch the slate with aiohttp and store it in the TTL cache
+        Sends the last ETag so an unchanged slate comes back as an empty 304
+        """
+        session = await self._get_session()
+        headers = {'If-None-Match': self._etag} if self._etag else None
+        async with self._limiter:
+            async with session.get(self.base_url, params=SLATE_PARAMS, headers=headers) as response:
+                if response.status == 304 and self._last_games is not None:
+                    # Slate unchanged since the last download; reuse it as-is
+                    games = self._last_games
+                elif response.status != 200:
+                    logger.error(f"Odds API error: {await response.text()}")
+                    return None
+                else:
+                    games = orjson.loads(await response.read())
+                    self._etag = response.headers.get('ETag')
+                    self._last_games = games
+        
+        with self._cache_lock:
+            self._cache[SLATE_CACHE_KEY] = games
+        return games
+        
+    def _index_games(self, games: Iterable[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Index every player prop in the slate by casefolded player name
+        Props keep slate order, so the first entry matches the old linear scan
+        """
+        index: Dict[str, List[Dict]] = {}
+        for game in games:
+            for bookmaker in game.get('bookmakers', ()):
+                for market in bookmaker.get('markets', ()):
+                    if market['key'] != 'player_props':
+                        continue
+                    
+                    for outcome in market['outcomes']:
+                        index.setdefault(outcome['name'].casefold(), []).append({
+                            'game_time': game['commence_time'],
+                            'home_team': game['home_team'],
+                            'away_team': game['away_team'],
+                            'bookmaker': bookmaker['title'],
+                            'prop_type': outcome['description'],
+                            'line': float(outcome['price']),
+                            'over_odds': outcome.get('over_odds', None),
+                            'under_odds': outcome.get('under_odds', None)
+                        })
+        return index
+        
+    def _cache_index(self, games: List[Dict]) -> Dict[str, List[Dict]]:
+        """
+        Build the player -> props index for a fresh slate and cache it
+        A revalidated (304) slate is the same object, so its index is reused
+        """
+        indexed = self._indexed
+        if indexed is not None and indexed[0] is games:
+            index = indexed[1]
+        else:
+            index = self._index_games(games)
+            self._indexed = (games, index)
+        with self._cache_lock:
+            self._cache['index'] = index
+        return index
+        
+    def _get_index(self) -> Optional[Dict[str, List[Dict]]]:
+        """
+        Get the player -> props index, rebuilt only when the slate is refetched
+        """
+        with self._cache_lock:
+            index = self._cache.get('index')
+        if index is not None:
+            return index
+        
+        with self._fetch_lock:
+            # Another thread may have fetched the slate while we waited
+            with self._cache_lock:
+                index = self._cache.get('index')
+            if index is not None:
+                return index
+            
+            index = self._fetch_index()
+            if index is None:
+                return None
+            with self._cache_lock:
+                self._cache['index'] = index
+            return index
+        
+    async def _aget_index(self) -> Optional[Dict[str, List[Dict]]]:
+        """
+        Async variant of _get_index
+        """
+        with self._cache_lock:
+            index = self._cache.get('index')
+        if index is not None:
+            return index
+        
+        games = await self._afetch_games()
+        if games is None:
+            return None
+        return self._cache_index(games)
+        
+    def _lookup_props(self, index: Dict[str, List[Dict]], player_name: str) -> Optional[Dict]:
+        """
+        Return the first prop for a player from the index
+        """
+        props = index.get(player_name.casefold())
+        if props:
+            return props[0]
+        
+        logger.warning(f"No props found for player: {player_name}")
+        return None
+        
     def get_player_props(self, player_name: str) -> Optional[Dict]:
         """
         Get player props from The Odds API
         Returns the most recent odds for the player's next game
         """
         try:
-            # Get all NBA games with odds
-            params = {
-                'regions': 'us',
-                'markets': 'player_props',
-                'oddsFormat': 'american'
-            }
-            
-            response = requests.get(
-                self.base_url,
-                headers=self.headers,
-                params=params
-            )
-            
-            if response.status_code != 200:
-                logger.error(f"Odds API error: {response.text}")
+            index = self._get_index()
+            if index is None:
                 return None
-                
-            games = response.json()
-            
-            # Find props for the specific player
-            for game in games:
-                if 'bookmakers' not in game:
-                    continue
-                    
-                for bookmaker in game['bookmakers']:
-                    if 'markets' not in bookmaker:
-                        continue
-                        
-                    for market in bookmaker['markets']:
-                        if market['key'] != 'player_props':
-                            continue
-                            
-                        for outcome in market['outcomes']:
-                            if outcome['name'].lower() == player_name.lower():
-                                return {
-                                    'game_time': game['commence_time'],
-                                    'home_team': game['home_team'],
-                                    'away_team': game['away_team'],
-                                    'bookmaker': bookmaker['title'],
-                                    'prop_type': outcome['description'],
-                                    'line': float(outcome['price']),
-                                    'over_odds': outcome.get('over_odds', None),
-                                    'under_odds': outcome.get('under_odds', None)
-                                }
+            return self._lookup_props(index, player_name)
             
-            logger.warning(f"No props found for player: {player_name}")
+        except Exception as e:
+            logger.error(f"Error fetching odds: {e}")
             return None
+    
+    async def aget_player_props(self, player_name: str) -> Optional[Dict]:
+        """
+        Async variant of get_player_props
+        """
+        try:
+            index = await self._aget_index()
+            if index is None:
+                return None
+            return self._lookup_props(index, player_name)
             
         except Exception as e:
             logger.error(f"Error fetching odds: {e}")
@@ -79,23 +276,43 @@ class OddsAPI:
     def calculate_confidence(self, prediction: float, line: float) -> Dict:
         """
         Calculate confidence percentage for over/under
-        Returns confidence percentage and recommended bet
+        Returns confidence percentage and recommended bet, or an error for a non-positive line
         """
+        if line <= 0:
+            return {
+                'error': 'Invalid betting line',
+                'prediction': prediction,
+                'line': line
+            }
+        
         diff = prediction - line
-        confidence = abs(diff) / line * 100
+        edge = abs(diff)
         
         return {
             'prediction': prediction,
             'line': line,
             'difference': diff,
-            'confidence': confidence,
-            'recommendation': 'over' if diff > 0 else 'under',
-            'edge': abs(diff)
+            'confidence': edge / line * 100,
+            'recommendation': RECOMMENDATIONS[diff > 0],
+            'edge': edge
         }
 
+@functools.lru_cache(maxsize=1)
+def get_odds_api() -> OddsAPI:
+    """
+    Process-wide OddsAPI, so every caller shares its connection pools,
+    caches, rate limiter and ETag state. Usable as a FastAPI dependency.
+    """
+    return OddsAPI()
+
+async def close_odds_api():
+    """Close the shared OddsAPI's client session (app shutdown)"""
+    if get_odds_api.cache_info().currsize:
+        await get_odds_api().close()
+
 class OddsComparison:
-    def __init__(self):
-        self.odds_api = OddsAPI()
+    def __init__(self, odds_api: Optional[OddsAPI] = None):
+        self.odds_api = odds_api or get_odds_api()
         
     def compare_prediction(self, player_name: str, prediction: float, stat_type: str) -> Dict:
         """
@@ -104,7 +321,36 @@ class OddsComparison:
         """
         # Get odds from API
         props = self.odds_api.get_player_props(player_name)
+        return self._compare(player_name, prediction, stat_type, props)
+    
+    async def acompare_prediction(self, player_name: str, prediction: float, stat_type: str) -> Dict:
+        """
+        Async variant of compare_prediction
+        """
+        props = await self.odds_api.aget_player_props(player_name)
+        return self._compare(player_name, prediction, stat_type, props)
+    
+    async def compare_predictions(
+        self,
+        items: List[Tuple[str, float, str]],
+        max_concurrency: int = 10
+    ) -> List[Dict]:
+        """
+        Compare a batch of (player_name, prediction, stat_type) items concurrently
+        Returns comparisons in the same order as items
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
         
+        async def compare(item: Tuple[str, float, str]) -> Dict:
+            async with semaphore:
+                return await self.acompare_prediction(*item)
+        
+        return await asyncio.gather(*(compare(item) for item in items))
+    
+    def _compare(self, player_name: str, prediction: float, stat_type: str, props: Optional[Dict]) -> Dict:
+        """
+        Build the comparison result for a player's props
+        """
         if not props:
             return {
                 'error': 'No odds available',
@@ -121,6 +367,11 @@ class OddsComparison:
         
         # Calculate confidence
         comparison = self.odds_api.calculate_confidence(prediction, props['line'])
+        if 'error' in comparison:
+            return {
+                'error': comparison['error'],
+                'prediction': prediction
+            }
         
         return {
             'player': player_name,
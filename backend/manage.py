@@ -10,12 +10,15 @@ Usage:
     python manage.py ingest_games --season 2024
     python manage.py ingest_stats --season 2024
     python manage.py ingest_all --season 2024
+    python manage.py refresh_metrics
 """
 
 import sys
 import argparse
+import functools
 import logging
-from datetime import date, datetime
+from contextlib import contextmanager
+from datetime import date
 from pathlib import Path
 
 # Add app directory to Python path
@@ -38,41 +41,64 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def get_db_session():
+@functools.lru_cache(maxsize=1)
+def _get_sessionmaker():
     """
-    Create and return a database session.
+    Create the engine and session factory once per process.
     """
     database_url = os.getenv("DATABASE_URL", "sqlite:///./visbets.db")
     # Convert async URL to sync URL for management scripts
     database_url = database_url.replace("sqlite+aiosqlite", "sqlite")
 
-    engine = create_engine(database_url, echo=False)
+    engine = create_engine(database_url, echo=False, pool_pre_ping=True, pool_size=5)
 
     # Create tables if they don't exist
     Base.metadata.create_all(bind=engine)
 
-    SessionLocal = sessionmaker(bind=engine)
-    return SessionLocal()
+    return sessionmaker(bind=engine)
 
 
-def cmd_ingest_teams(args):
+def get_db_session():
     """
-    Ingest all NBA teams.
+    Create and return a database session.
     """
-    logger.info("=" * 60)
-    logger.info("INGESTING TEAMS")
-    logger.info("=" * 60)
+    return _get_sessionmaker()()
+
+
+@contextmanager
+def _service_scope(service=None):
+    """
+    Yield an IngestionService, reusing the given one or opening a new one.
+
+    Opening a service creates a DB engine/session and an HTTP client, so
+    multi-stage commands pass one service through every stage.
+    """
+    if service is not None:
+        yield service
+        return
 
     db = get_db_session()
     try:
         with IngestionService(db) as service:
-            count = service.ingest_teams()
-            logger.info(f"✅ Successfully ingested {count} teams")
+            yield service
     finally:
         db.close()
 
 
-def cmd_ingest_players(args):
+def cmd_ingest_teams(args, service=None):
+    """
+    Ingest all NBA teams.
+    """
+    logger.info("=" * 60)
+    logger.info("INGESTING TEAMS")
+    logger.info("=" * 60)
+
+    with _service_scope(service) as service:
+        count = service.ingest_teams()
+        logger.info(f"✅ Successfully ingested {count} teams")
+
+
+def cmd_ingest_players(args, service=None):
     """
     Ingest all NBA players.
     """
@@ -80,16 +106,12 @@ def cmd_ingest_players(args):
     logger.info("INGESTING PLAYERS")
     logger.info("=" * 60)
 
-    db = get_db_session()
-    try:
-        with IngestionService(db) as service:
-            count = service.ingest_players()
-            logger.info(f"✅ Successfully ingested {count} players")
-    finally:
-        db.close()
+    with _service_scope(service) as service:
+        count = service.ingest_players()
+        logger.info(f"✅ Successfully ingested {count} players")
 
 
-def cmd_ingest_games(args):
+def cmd_ingest_games(args, service=None):
     """
     Ingest games for a specific season.
     """
@@ -98,33 +120,27 @@ def cmd_ingest_games(args):
     logger.info(f"INGESTING GAMES FOR SEASON {season}")
     logger.info("=" * 60)
 
-    # Parse optional date filters
-    start_date = None
-    end_date = None
+    # Date filters are parsed by argparse
+    start_date = args.start_date
+    end_date = args.end_date
 
-    if args.start_date:
-        start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    if start_date:
         logger.info(f"Start date filter: {start_date}")
 
-    if args.end_date:
-        end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date()
+    if end_date:
         logger.info(f"End date filter: {end_date}")
 
-    db = get_db_session()
-    try:
-        with IngestionService(db) as service:
-            count = service.ingest_games(
-                season=season,
-                start_date=start_date,
-                end_date=end_date,
-                postseason=args.postseason
-            )
-            logger.info(f"✅ Successfully ingested {count} games")
-    finally:
-        db.close()
+    with _service_scope(service) as service:
+        count = service.ingest_games(
+            season=season,
+            start_date=start_date,
+            end_date=end_date,
+            postseason=args.postseason
+        )
+        logger.info(f"✅ Successfully ingested {count} games")
 
 
-def cmd_ingest_stats(args):
+def cmd_ingest_stats(args, service=None):
     """
     Ingest player game stats for a specific season.
     """
@@ -133,62 +149,79 @@ def cmd_ingest_stats(args):
     logger.info(f"INGESTING STATS FOR SEASON {season}")
     logger.info("=" * 60)
 
-    # Parse optional date filters
-    start_date = None
-    end_date = None
+    # Date filters are parsed by argparse
+    start_date = args.start_date
+    end_date = args.end_date
 
-    if args.start_date:
-        start_date = datetime.strptime(args.start_date, '%Y-%m-%d').date()
+    if start_date:
         logger.info(f"Start date filter: {start_date}")
 
-    if args.end_date:
-        end_date = datetime.strptime(args.end_date, '%Y-%m-%d').date()
+    if end_date:
         logger.info(f"End date filter: {end_date}")
 
-    db = get_db_session()
-    try:
-        with IngestionService(db) as service:
-            count = service.ingest_stats(
-                season=season,
-                start_date=start_date,
-                end_date=end_date,
-                postseason=args.postseason
-            )
-            logger.info(f"✅ Successfully ingested {count} stat records")
-    finally:
-        db.close()
+    with _service_scope(service) as service:
+        count = service.ingest_stats(
+            season=season,
+            start_date=start_date,
+            end_date=end_date,
+            postseason=args.postseason
+        )
+        logger.info(f"✅ Successfully ingested {count} stat records")
 
 
 def cmd_ingest_all(args):
     """
     Run all ingestion steps in sequence.
+
+    Stages stay sequential: players resolve team IDs from ingested teams,
+    stats need games, and every stage shares one BallDontLie rate limit.
+    They do share a single service, so the DB engine and HTTP connection
+    (and the client's rate-limit clock) carry over between stages.
     """
     season = args.season
     logger.info("=" * 60)
     logger.info(f"FULL INGESTION PIPELINE FOR SEASON {season}")
     logger.info("=" * 60)
 
-    # Step 1: Teams
-    logger.info("\n[1/4] Ingesting teams...")
-    cmd_ingest_teams(args)
+    with _service_scope() as service:
+        # Step 1: Teams
+        logger.info("\n[1/4] Ingesting teams...")
+        cmd_ingest_teams(args, service)
 
-    # Step 2: Players
-    logger.info("\n[2/4] Ingesting players...")
-    cmd_ingest_players(args)
+        # Step 2: Players
+        logger.info("\n[2/4] Ingesting players...")
+        cmd_ingest_players(args, service)
 
-    # Step 3: Games
-    logger.info("\n[3/4] Ingesting games...")
-    cmd_ingest_games(args)
+        # Step 3: Games
+        logger.info("\n[3/4] Ingesting games...")
+        cmd_ingest_games(args, service)
 
-    # Step 4: Stats
-    logger.info("\n[4/4] Ingesting stats...")
-    cmd_ingest_stats(args)
+        # Step 4: Stats
+        logger.info("\n[4/4] Ingesting stats...")
+        cmd_ingest_stats(args, service)
 
     logger.info("\n" + "=" * 60)
     logger.info("✅ FULL INGESTION COMPLETE")
     logger.info("=" * 60)
 
 
+def cmd_refresh_metrics(args):
+    """
+    Recompute materialized player metrics from stored game stats.
+    """
+    logger.info("=" * 60)
+    logger.info("REFRESHING PLAYER METRICS")
+    logger.info("=" * 60)
+
+    db = get_db_session()
+    try:
+        with IngestionService(db) as service:
+            count = service.refresh_player_metrics()
+            logger.info(f"✅ Successfully refreshed metrics for {count} players")
+    finally:
+        db.close()
+
+
 def cmd_init_db(args):
     """
     Initialize the database (create tables).
@@ -233,9 +266,11 @@ Examples:
 
   # Run full pipeline
   python manage.py ingest_all --season 2024
+
+  # Rebuild materialized player metrics
+  python manage.py refresh_metrics
         """
     )
-
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
 
     # init_db command
@@ -253,27 +288,31 @@ Examples:
     # ingest_games command
     parser_games = subparsers.add_parser('ingest_games', help='Ingest games for a season')
     parser_games.add_argument('--season', type=int, required=True, help='Season year (e.g., 2024)')
-    parser_games.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD)')
-    parser_games.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
+    parser_games.add_argument('--start-date', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+    parser_games.add_argument('--end-date', type=date.fromisoformat, help='End date (YYYY-MM-DD)')
     parser_games.add_argument('--postseason', action='store_true', help='Include playoff games')
     parser_games.set_defaults(func=cmd_ingest_games)
 
     # ingest_stats command
     parser_stats = subparsers.add_parser('ingest_stats', help='Ingest player game stats for a season')
     parser_stats.add_argument('--season', type=int, required=True, help='Season year (e.g., 2024)')
-    parser_stats.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD)')
-    parser_stats.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
+    parser_stats.add_argument('--start-date', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+    parser_stats.add_argument('--end-date', type=date.fromisoformat, help='End date (YYYY-MM-DD)')
     parser_stats.add_argument('--postseason', action='store_true', help='Include playoff stats')
     parser_stats.set_defaults(func=cmd_ingest_stats)
 
     # ingest_all command
     parser_all = subparsers.add_parser('ingest_all', help='Run full ingestion pipeline')
     parser_all.add_argument('--season', type=int, required=True, help='Season year (e.g., 2024)')
-    parser_all.add_argument('--start-date', type=str, help='Start date (YYYY-MM-DD)')
-    parser_all.add_argument('--end-date', type=str, help='End date (YYYY-MM-DD)')
+    parser_all.add_argument('--start-date', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+    parser_all.add_argument('--end-date', type=date.fromisoformat, help='End date (YYYY-MM-DD)')
     parser_all.add_argument('--postseason', action='store_true', help='Include playoff data')
     parser_all.set_defaults(func=cmd_ingest_all)
 
+    # refresh_metrics command
+    parser_metrics = subparsers.add_parser('refresh_metrics', help='Recompute materialized player metrics')
+    parser_metrics.set_defaults(func=cmd_refresh_metrics)
+
     args = parser.parse_args()
 
     if not args.command:
@@ -13,20 +13,27 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from dotenv import load_dotenv
 load_dotenv()
 
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, insert, select, text
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
 import os
 import random
 
+from app.db.database import enable_sqlite_bulk_pragmas
 from app.db.models import Base, Player, Game, PlayerGameStats, SportsbookLine
 
+MARKETS = ('points', 'rebounds', 'assists', 'pra')
+
+# Fixed seed so repeated runs produce the same mock lines
+RANDOM_SEED = 42
+
 def main():
     # Get database connection
     database_url = os.getenv("DATABASE_URL", "sqlite:///./visbets.db")
     database_url = database_url.replace("sqlite+aiosqlite", "sqlite")
 
     engine = create_engine(database_url, echo=False)
+    enable_sqlite_bulk_pragmas(engine)
     Session = sessionmaker(bind=engine)
     db = Session()
 
@@ -36,8 +43,8 @@ def main():
     today = datetime(2024, 12, 7)
     tomorrow = today + timedelta(days=1)
 
-    # Get games for today
-    games_stmt = select(Game).where(
+    # Get games for today (ids only; loading Game rows would eager-load their stats)
+    games_stmt = select(Game.id).where(
         Game.date >= today,
         Game.date < tomorrow
     )
@@ -52,26 +59,26 @@ def main():
 
     # Get all players (since we don't have stats for all games, just use any players)
     # In production, we'd match players to games, but for MVP testing we'll create lines for any players
-    players_stmt = select(Player).limit(50)  # Get 50 players for testing
-    players = db.execute(players_stmt).scalars().all()
+    players_stmt = select(Player.id).limit(50)  # Get 50 players for testing
+    player_ids = db.execute(players_stmt).scalars().all()
 
-    if not players:
+    if not player_ids:
         print("No players found in database")
         print("Run: python manage.py ingest_players")
         return
 
-    print(f"Using {len(players)} players for mock lines")
+    print(f"Using {len(player_ids)} players for mock lines")
 
     # Create lines for each player
-    markets = ['points', 'rebounds', 'assists', 'pra']
-    line_count = 0
+    rng = random.Random(RANDOM_SEED)
+    rows = []
 
-    for player in players:
+    for player_id in player_ids:
         # Use realistic baseline values for MVP testing
         # Points: 15-25, Rebounds: 4-10, Assists: 3-8
-        base_points = random.uniform(15, 25)
-        base_rebounds = random.uniform(4, 10)
-        base_assists = random.uniform(3, 8)
+        base_points = rng.uniform(15, 25)
+        base_rebounds = rng.uniform(4, 10)
+        base_assists = rng.uniform(3, 8)
 
         line_data = {
             'points': round(base_points, 1),
@@ -80,19 +87,24 @@ def main():
             'pra': round(base_points + base_rebounds + base_assists, 1),
         }
 
-        for market in markets:
-            line = SportsbookLine(
-                player_id=player.id,
-                date=today,
-                market=market,
-                line_value=line_data[market],
-                book='PrizePicks'
-            )
-            db.add(line)
-            line_count += 1
-
+        for market in MARKETS:
+            rows.append({
+                'player_id': player_id,
+                'date': today,
+                'market': market,
+                'line_value': line_data[market],
+                'book': 'PrizePicks',
+            })
+
+    # Single executemany INSERT instead of tracking one ORM object per line
+    db.execute(insert(SportsbookLine), rows)
+
+    # Refresh SQLite planner statistics after the bulk load
+    if engine.dialect.name == "sqlite":
+        db.execute(text("ANALYZE"))
     db.commit()
-    print(f"✅ Created {line_count} mock sportsbook lines for {len(players)} players")
+    line_count = len(rows)
+    print(f"✅ Created {line_count} mock sportsbook lines for {len(player_ids)} players")
     print(f"\nYou can now test the slate endpoint:")
     print(f"  curl 'http://localhost:8000/api/slate?date_str={today.date()}'")
 
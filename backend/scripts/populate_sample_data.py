@@ -6,13 +6,15 @@ This creates mock data to test the full flow without external APIs.
 import asyncio
 from datetime import datetime, timedelta
 import random
+import numpy as np
+from sqlalchemy import insert, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.db.database import AsyncSessionLocal
+from app.db.database import AsyncSessionLocal, async_engine, enable_sqlite_bulk_pragmas
 from app.db.models import Player, Team, Game, PlayerGameStats, SportsbookLine
 
 
@@ -85,168 +87,169 @@ PLAYERS = [
 ]
 
 
-def generate_player_stats(avg_points, avg_rebounds, avg_assists, variance=0.3):
-    """Generate realistic random stats with variance."""
-    points = max(0, avg_points + random.uniform(-avg_points * variance, avg_points * variance))
-    rebounds = max(0, avg_rebounds + random.uniform(-avg_rebounds * variance, avg_rebounds * variance))
-    assists = max(0, avg_assists + random.uniform(-avg_assists * variance, avg_assists * variance))
-    minutes = random.uniform(28, 38)
-
+def market_baselines(player_data):
+    """Baseline line value for each market from a player's averages."""
     return {
-        "points": round(points, 1),
-        "rebounds": round(rebounds, 1),
-        "assists": round(assists, 1),
-        "minutes": round(minutes, 1),
+        "points": player_data["avg_points"],
+        "rebounds": player_data["avg_rebounds"],
+        "assists": player_data["avg_assists"],
+        "pra": player_data["avg_points"] + player_data["avg_rebounds"] + player_data["avg_assists"],
     }
 
 
+def generate_player_stats(players, n_games, variance=0.3, rng=None):
+    """
+    Generate realistic random stats with variance for every player and game at once.
+
+    Returns a (players, games, 3) array of points/rebounds/assists and a
+    (players, games) array of minutes, all rounded to one decimal place.
+    """
+    rng = rng or np.random.default_rng()
+    avg = np.array([[p["avg_points"], p["avg_rebounds"], p["avg_assists"]] for p in players])
+    noise = rng.uniform(-variance, variance, size=(len(players), n_games, 3)) * avg[:, None, :]
+    stats = np.clip(avg[:, None, :] + noise, 0, None).round(1)
+    minutes = rng.uniform(28, 38, size=(len(players), n_games)).round(1)
+    return stats, minutes
+
+
 async def populate_database():
     """Populate database with sample data."""
+    enable_sqlite_bulk_pragmas(async_engine)
+
     async with AsyncSessionLocal() as db:
         print("🏀 Starting database population...")
 
+        # Each table is written with one batched INSERT; RETURNING gives back the
+        # generated ids (in parameter order) where later tables need foreign keys.
+        # Everything is committed once at the end.
+
         # 1. Create teams
         print("\n1️⃣ Creating teams...")
-        team_objs = {}
-        for team_data in TEAMS:
-            team = Team(
-                name=team_data["name"],
-                abbreviation=team_data["abbreviation"],
-                city=team_data["city"],
-                full_name=team_data["name"],
-            )
-            db.add(team)
-            await db.flush()
-            team_objs[team_data["abbreviation"]] = team
-            print(f"   ✓ {team.name}")
-
-        await db.commit()
+        team_rows = [
+            {
+                "name": team_data["name"],
+                "abbreviation": team_data["abbreviation"],
+                "city": team_data["city"],
+                "full_name": team_data["name"],
+            }
+            for team_data in TEAMS
+        ]
+        result = await db.execute(
+            insert(Team).returning(Team.id, sort_by_parameter_order=True), team_rows
+        )
+        team_ids = {}
+        for team_row, team_id in zip(team_rows, result.scalars().all()):
+            team_ids[team_row["abbreviation"]] = team_id
+            print(f"   ✓ {team_row['name']}")
 
         # 2. Create players
         print("\n2️⃣ Creating players...")
-        player_objs = []
-        for player_data in PLAYERS:
-            team = team_objs[player_data["team_abbr"]]
-            player = Player(
-                first_name=player_data["first_name"],
-                last_name=player_data["last_name"],
-                full_name=player_data["full_name"],
-                position=player_data["position"],
-                jersey_number=player_data["jersey_number"],
-                team_id=team.id,
-                image_url=f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player_data['full_name'].replace(' ', '_')}.png",
-            )
-            db.add(player)
-            await db.flush()
-            player_objs.append((player, player_data))
-            print(f"   ✓ {player.full_name} ({player_data['team_abbr']})")
-
-        await db.commit()
+        player_rows = [
+            {
+                "first_name": player_data["first_name"],
+                "last_name": player_data["last_name"],
+                "full_name": player_data["full_name"],
+                "position": player_data["position"],
+                "jersey_number": player_data["jersey_number"],
+                "team_id": team_ids[player_data["team_abbr"]],
+                "image_url": f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player_data['full_name'].replace(' ', '_')}.png",
+                # Game stats are written below, outside ingestion; mark them so no
+                # materialized player_metrics row is treated as current
+                "stats_updated_at": datetime.utcnow(),
+            }
+            for player_data in PLAYERS
+        ]
+        result = await db.execute(
+            insert(Player).returning(Player.id, sort_by_parameter_order=True), player_rows
+        )
+        player_ids = []
+        for player_id, player_data in zip(result.scalars().all(), PLAYERS):
+            player_ids.append((player_id, player_data))
+            print(f"   ✓ {player_data['full_name']} ({player_data['team_abbr']})")
 
         # 3. Create games
         print("\n3️⃣ Creating games...")
-        games = []
 
         # Today's games
         today = datetime.now().replace(hour=19, minute=0, second=0, microsecond=0)
-        game1 = Game(
-            date=today,
-            home_team="LAL",
-            away_team="BOS",
-            status="scheduled",
-        )
-        game2 = Game(
-            date=today,
-            home_team="GSW",
-            away_team="PHX",
-            status="scheduled",
-        )
-        game3 = Game(
-            date=today,
-            home_team="MIA",
-            away_team="LAL",
-            status="scheduled",
-        )
-        db.add_all([game1, game2, game3])
-        await db.flush()
-        games.extend([game1, game2, game3])
+        game_rows = [
+            {"date": today, "home_team": "LAL", "away_team": "BOS", "status": "scheduled"},
+            {"date": today, "home_team": "GSW", "away_team": "PHX", "status": "scheduled"},
+            {"date": today, "home_team": "MIA", "away_team": "LAL", "status": "scheduled"},
+        ]
 
         # Past 15 games
         for i in range(1, 16):
-            game_date = datetime.now() - timedelta(days=i)
-            game = Game(
-                date=game_date,
-                home_team=random.choice(list(team_objs.keys())),
-                away_team=random.choice(list(team_objs.keys())),
-                status="finished",
-            )
-            db.add(game)
-            await db.flush()
-            games.append(game)
+            game_rows.append({
+                "date": datetime.now() - timedelta(days=i),
+                "home_team": random.choice(list(team_ids.keys())),
+                "away_team": random.choice(list(team_ids.keys())),
+                "status": "finished",
+            })
+
+        result = await db.execute(
+            insert(Game).returning(Game.id, sort_by_parameter_order=True), game_rows
+        )
+        games = [
+            {**game_row, "id": game_id}
+            for game_row, game_id in zip(game_rows, result.scalars().all())
+        ]
 
-        await db.commit()
         print(f"   ✓ Created {len(games)} games")
 
         # 4. Create player game stats
         print("\n4️⃣ Creating player game stats...")
-        stats_count = 0
-        for player, player_data in player_objs:
-            # Create stats for past games only
-            past_games = [g for g in games if g.status == "finished"]
-            for game in past_games[:12]:  # Last 12 games per player
-                stats = generate_player_stats(
-                    player_data["avg_points"],
-                    player_data["avg_rebounds"],
-                    player_data["avg_assists"],
-                )
-                player_game_stat = PlayerGameStats(
-                    player_id=player.id,
-                    game_id=game.id,
-                    date=game.date,
-                    **stats,
-                )
-                db.add(player_game_stat)
-                stats_count += 1
+        # Create stats for past games only, last 12 games per player
+        past_games = [g for g in games if g["status"] == "finished"][:12]
+        stats, minutes = generate_player_stats(PLAYERS, len(past_games))
+        stat_rows = [
+            {
+                "player_id": player_id,
+                "game_id": game["id"],
+                "date": game["date"],
+                "points": points,
+                "rebounds": rebounds,
+                "assists": assists,
+                "minutes": player_minutes,
+            }
+            for (player_id, _), player_stats, player_minutes_row in zip(player_ids, stats.tolist(), minutes.tolist())
+            for game, (points, rebounds, assists), player_minutes in zip(past_games, player_stats, player_minutes_row)
+        ]
+
+        await db.execute(insert(PlayerGameStats), stat_rows)
+        stats_count = len(stat_rows)
 
-        await db.commit()
         print(f"   ✓ Created {stats_count} player game stats")
 
         # 5. Create sportsbook lines for today's games
         print("\n5️⃣ Creating sportsbook lines...")
-        lines_count = 0
-        for player, player_data in player_objs:
-            # Create lines for today
-            markets = ["points", "rebounds", "assists", "pra"]
-            for market in markets:
-                if market == "points":
-                    base = player_data["avg_points"]
-                elif market == "rebounds":
-                    base = player_data["avg_rebounds"]
-                elif market == "assists":
-                    base = player_data["avg_assists"]
-                else:  # pra
-                    base = player_data["avg_points"] + player_data["avg_rebounds"] + player_data["avg_assists"]
-
-                # Add some variance to the line
-                line_value = base + random.uniform(-2, 2)
-
-                sportsbook_line = SportsbookLine(
-                    player_id=player.id,
-                    date=today,
-                    market=market,
-                    line_value=round(line_value, 1),
-                    book="PrizePicks",
-                )
-                db.add(sportsbook_line)
-                lines_count += 1
+        # Create lines for today, with some variance around each market's baseline
+        line_rows = [
+            {
+                "player_id": player_id,
+                "date": today,
+                "market": market,
+                "line_value": round(base + random.uniform(-2, 2), 1),
+                "book": "PrizePicks",
+            }
+            for player_id, player_data in player_ids
+            for market, base in market_baselines(player_data).items()
+        ]
+
+        await db.execute(insert(SportsbookLine), line_rows)
+        lines_count = len(line_rows)
+
+        # Refresh SQLite planner statistics after the bulk load
+        if async_engine.dialect.name == "sqlite":
+            await db.execute(text("ANALYZE"))
 
         await db.commit()
         print(f"   ✓ Created {lines_count} sportsbook lines")
 
         print("\n✅ Database population complete!")
         print(f"\nSummary:")
-        print(f"  - Teams: {len(team_objs)}")
-        print(f"  - Players: {len(player_objs)}")
+        print(f"  - Teams: {len(team_ids)}")
+        print(f"  - Players: {len(player_ids)}")
         print(f"  - Games: {len(games)}")
         print(f"  - Player Stats: {stats_count}")
         print(f"  - Sportsbook Lines: {lines_count}")
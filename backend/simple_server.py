@@ -2,12 +2,17 @@
 Simple standalone FastAPI server for testing the VisBets MVP frontend.
 This bypasses all the configuration and dependency issues.
 """
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from datetime import datetime, timedelta
-import random
+import functools
+import numpy as np
+import orjson
+import xxhash
 
-app = FastAPI(title="VisBets MVP - Simple Server")
+app = FastAPI(title="VisBets MVP - Simple Server", default_response_class=ORJSONResponse)
 
 # Enable CORS
 app.add_middleware(
@@ -18,6 +23,61 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON bodies. Registered before the ETag middleware so it runs inside it:
+# the ETag then hashes the encoded body, so gzip and identity responses get distinct tags.
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+
+# Browser/CDN caching for GET /api/* responses; past slates never change
+API_CACHE_CONTROL = "public, max-age=60"
+HISTORICAL_SLATE_CACHE_CONTROL = "public, max-age=86400, immutable"
+
+
+def set_cache_headers(request: Request, response: Response) -> Response:
+    """Add Cache-Control/Vary caching headers to a GET /api/* response."""
+    cache_control = API_CACHE_CONTROL
+    if request.url.path == "/api/slate":
+        try:
+            slate_date = datetime.strptime(request.query_params.get("date_str", ""), "%Y-%m-%d").date()
+        except ValueError:
+            slate_date = None
+        if slate_date and slate_date < datetime.now().date():
+            cache_control = HISTORICAL_SLATE_CACHE_CONTROL
+
+    response.headers["Cache-Control"] = cache_control
+    vary = response.headers.get("Vary")
+    response.headers["Vary"] = f"{vary}, Accept" if vary else "Accept"
+    return response
+
+
+@app.middleware("http")
+async def etag_middleware(request: Request, call_next):
+    """Tag GET /api/* responses with a body hash and caching headers; answer a matching If-None-Match with 304."""
+    response = await call_next(request)
+    if request.method != "GET" or not request.url.path.startswith("/api/") or response.status_code != 200:
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = f'"{xxhash.xxh3_64_hexdigest(body)}"'
+
+    # Carry every original header (raw, so repeated ones like Set-Cookie survive);
+    # the 304 repeats them, including Vary and CORS, minus the body's content headers
+    headers = [(key, value) for key, value in response.headers.raw if key != b"content-length"]
+    headers.append((b"etag", etag.encode("latin-1")))
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+        not_modified = Response(status_code=304)
+        not_modified.raw_headers.extend(
+            header for header in headers if header[0] not in (b"content-type", b"content-encoding")
+        )
+        return set_cache_headers(request, not_modified)
+
+    full = Response(content=body, status_code=response.status_code)
+    full.raw_headers.extend(headers)
+    return set_cache_headers(request, full)
+
+
 # Mock data
 PLAYERS = [
     {"id": 1, "name": "LeBron James", "team": "LAL", "position": "F", "opponent": "BOS"},
@@ -27,20 +87,83 @@ PLAYERS = [
     {"id": 5, "name": "Kevin Durant", "team": "PHX", "position": "F", "opponent": "GSW"},
 ]
 
-PLAYER_STATS = {
-    1: {"season_avg": 26.5, "last5_avg": 28.3, "last10_avg": 27.1},
-    2: {"season_avg": 28.0, "last5_avg": 27.5, "last10_avg": 28.2},
-    3: {"season_avg": 27.0, "last5_avg": 29.1, "last10_avg": 28.0},
-    4: {"season_avg": 22.0, "last5_avg": 24.1, "last10_avg": 23.2},
-    5: {"season_avg": 29.0, "last5_avg": 30.2, "last10_avg": 29.5},
+# Per-player averages as parallel arrays (struct-of-arrays); PLAYER_ROW maps id -> row
+PLAYER_IDS = np.array([1, 2, 3, 4, 5])
+SEASON_AVG = np.array([26.5, 28.0, 27.0, 22.0, 29.0])
+LAST5_AVG = np.array([28.3, 27.5, 29.1, 24.1, 30.2])
+LAST10_AVG = np.array([27.1, 28.2, 28.0, 23.2, 29.5])
+PLAYER_ROW = {player_id: row for row, player_id in enumerate(PLAYER_IDS.tolist())}
+
+
+def headshot_url(name):
+    """Mock CDN headshot URL for a player name."""
+    return f"https://cdn.nba.com/headshots/nba/latest/1040x760/{name.replace(' ', '_')}.png"
+
+
+# Per-player fields that never change, built once at import instead of per request
+SLATE_PLAYERS = [
+    {
+        "player_id": p["id"],
+        "name": p["name"],
+        "team": p["team"],
+        "position": p["position"],
+        "opponent": p["opponent"],
+        "image_url": headshot_url(p["name"]),
+    }
+    for p in PLAYERS
+]
+
+DETAIL_PLAYERS = {
+    p["id"]: {
+        "id": p["id"],
+        "name": p["name"],
+        "team": p["team"],
+        "position": p["position"],
+        "image_url": headshot_url(p["name"]),
+        "height": "6-9",
+        "weight": "250",
+        "jersey_number": str(p["id"] * 10),
+    }
+    for p in PLAYERS
+}
+
+# Detail-page averages per player, including the derived PRA values
+SEASON_AVERAGES = {
+    player_id: {"points": season, "rebounds": 7.5, "assists": 6.2, "pra": season + 13.7}
+    for player_id, season in zip(PLAYER_IDS.tolist(), SEASON_AVG.tolist())
 }
 
+ROLLING_AVERAGES = {
+    player_id: {
+        "last5_points": last5,
+        "last5_rebounds": 7.8,
+        "last5_assists": 6.5,
+        "last5_pra": last5 + 14.3,
+        "last10_points": last10,
+        "last10_rebounds": 7.6,
+        "last10_assists": 6.3,
+        "last10_pra": last10 + 13.9,
+    }
+    for player_id, last5, last10 in zip(PLAYER_IDS.tolist(), LAST5_AVG.tolist(), LAST10_AVG.tolist())
+}
+
+# (market, base average) pairs used for slate lines
+SLATE_MARKETS = (("points", 25), ("rebounds", 7), ("assists", 6), ("pra", 38))
+
+# Mock game logs: columns are points (offset by season avg), rebounds, assists, minutes
+GAME_LOG_COUNT = 10
+GAME_LOG_OPPONENTS = ["BOS", "LAL", "GSW", "PHX", "MIA"]
+GAME_LOG_BASE = np.array([0.0, 7.0, 6.0, 0.0])
+GAME_LOG_LOW = np.array([-5.0, -2.0, -2.0, 30.0])
+GAME_LOG_HIGH = np.array([5.0, 2.0, 2.0, 38.0])
+
 
-def generate_market_data(player_id, market, base_avg):
-    """Generate mock market data."""
-    line = base_avg + random.uniform(-2, 2)
-    season_avg = PLAYER_STATS[player_id]["season_avg"] if market == "points" else base_avg
-    last5_avg = PLAYER_STATS[player_id]["last5_avg"] if market == "points" else base_avg * 1.1
+def generate_market_data(player_id, market, base_avg, delta):
+    """Generate mock market data; delta is the line's pre-drawn offset from base_avg."""
+    line = base_avg + delta
+    row = PLAYER_ROW[player_id]
+    season_avg = SEASON_AVG.item(row) if market == "points" else base_avg
+    last5_avg = LAST5_AVG.item(row) if market == "points" else base_avg * 1.1
 
     return {
         "market": market,
@@ -61,29 +184,21 @@ def root():
     return {"message": "VisBets MVP API", "status": "running"}
 
 
-@app.get("/api/slate")
-def get_slate(date_str: str = None):
-    """Get today's slate of players."""
-    date = date_str or datetime.now().strftime("%Y-%m-%d")
-
-    players_data = []
-    for player in PLAYERS:
-        markets = [
-            generate_market_data(player["id"], "points", 25),
-            generate_market_data(player["id"], "rebounds", 7),
-            generate_market_data(player["id"], "assists", 6),
-            generate_market_data(player["id"], "pra", 38),
-        ]
-
-        players_data.append({
-            "player_id": player["id"],
-            "name": player["name"],
-            "team": player["team"],
-            "position": player["position"],
-            "opponent": player["opponent"],
-            "image_url": f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player['name'].replace(' ', '_')}.png",
-            "markets": markets
-        })
+def _build_slate(date):
+    """Build the mock slate for a date, seeded by the date so repeat calls are stable."""
+    # Every line offset in one draw: rows are players, columns are markets
+    rng = np.random.default_rng(xxhash.xxh3_64_intdigest(f"slate:{date}".encode()))
+    deltas = rng.uniform(-2, 2, size=(len(SLATE_PLAYERS), len(SLATE_MARKETS))).tolist()
+    players_data = [
+        {
+            **player,
+            "markets": [
+                generate_market_data(player["player_id"], market, base_avg, delta)
+                for (market, base_avg), delta in zip(SLATE_MARKETS, player_deltas)
+            ],
+        }
+        for player, player_deltas in zip(SLATE_PLAYERS, deltas)
+    ]
 
     return {
         "date": date,
@@ -91,74 +206,109 @@ def get_slate(date_str: str = None):
     }
 
 
-@app.get("/api/player/{player_id}")
-def get_player_detail(player_id: int):
-    """Get player detail."""
-    player = next((p for p in PLAYERS if p["id"] == player_id), None)
-    if not player:
-        return {"error": "Player not found"}, 404
-
-    # Generate game logs
-    game_logs = []
-    for i in range(10):
-        date = (datetime.now() - timedelta(days=i+1)).strftime("%Y-%m-%d")
-        points = PLAYER_STATS[player_id]["season_avg"] + random.uniform(-5, 5)
-        rebounds = 7 + random.uniform(-2, 2)
-        assists = 6 + random.uniform(-2, 2)
-
-        game_logs.append({
+@functools.lru_cache(maxsize=8)
+def _build_slate_bytes(date):
+    """Serialized slate for a date, cached so warm hits skip both the build and the JSON encode."""
+    return orjson.dumps(_build_slate(date), option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+@app.get("/api/slate")
+def get_slate(date_str: str = None):
+    """Get today's slate of players."""
+    body = _build_slate_bytes(date_str or datetime.now().strftime("%Y-%m-%d"))
+    return Response(content=body, media_type="application/json")
+
+
+@functools.lru_cache(maxsize=64)
+def _build_player_detail(player_id, today):
+    """Build mock player detail for a day, seeded by (player, day) so repeat calls are stable and cached."""
+    player = DETAIL_PLAYERS[player_id]
+    today_dt = datetime.strptime(today, "%Y-%m-%d")
+    season_avg = SEASON_AVG.item(PLAYER_ROW[player_id])
+
+    # Generate game logs: one (games, stats) draw instead of a per-game loop
+    rng = np.random.default_rng((player_id, today_dt.toordinal()))
+    stats = GAME_LOG_BASE + rng.uniform(GAME_LOG_LOW, GAME_LOG_HIGH, size=(GAME_LOG_COUNT, 4))
+    stats[:, 0] += season_avg
+    pra = stats[:, :3].sum(axis=1)
+    points, rebounds, assists, minutes = np.round(stats, 1).T.tolist()
+    dates = [(today_dt - timedelta(days=i + 1)).strftime("%Y-%m-%d") for i in range(GAME_LOG_COUNT)]
+    opponents = rng.choice(GAME_LOG_OPPONENTS, size=GAME_LOG_COUNT).tolist()
+
+    game_logs = [
+        {
             "date": date,
-            "opponent": random.choice(["BOS", "LAL", "GSW", "PHX", "MIA"]),
-            "points": round(points, 1),
-            "rebounds": round(rebounds, 1),
-            "assists": round(assists, 1),
-            "minutes": round(random.uniform(30, 38), 1),
-            "pra": round(points + rebounds + assists, 1),
-        })
-
-    # Current lines
+            "opponent": opponent,
+            "points": pts,
+            "rebounds": reb,
+            "assists": ast,
+            "minutes": mins,
+            "pra": total,
+        }
+        for date, opponent, pts, reb, ast, mins, total in zip(
+            dates, opponents, points, rebounds, assists, minutes, np.round(pra, 1).tolist()
+        )
+    ]
+
+    # Current lines, offsets drawn from the same generator
+    points_delta, rebounds_delta, assists_delta, pra_delta = rng.uniform(-2, 2, size=4).tolist()
     current_lines = [
-        generate_market_data(player_id, "points", PLAYER_STATS[player_id]["season_avg"]),
-        generate_market_data(player_id, "rebounds", 7),
-        generate_market_data(player_id, "assists", 6),
-        generate_market_data(player_id, "pra", 38),
+        generate_market_data(player_id, "points", season_avg, points_delta),
+        generate_market_data(player_id, "rebounds", 7, rebounds_delta),
+        generate_market_data(player_id, "assists", 6, assists_delta),
+        generate_market_data(player_id, "pra", 38, pra_delta),
     ]
 
     return {
-        "player": {
-            "id": player_id,
-            "name": player["name"],
-            "team": player["team"],
-            "position": player["position"],
-            "image_url": f"https://cdn.nba.com/headshots/nba/latest/1040x760/{player['name'].replace(' ', '_')}.png",
-            "height": "6-9",
-            "weight": "250",
-            "jersey_number": str(player_id * 10),
-        },
-        "season_averages": {
-            "points": PLAYER_STATS[player_id]["season_avg"],
-            "rebounds": 7.5,
-            "assists": 6.2,
-            "pra": PLAYER_STATS[player_id]["season_avg"] + 13.7,
-        },
-        "rolling_averages": {
-            "last5_points": PLAYER_STATS[player_id]["last5_avg"],
-            "last5_rebounds": 7.8,
-            "last5_assists": 6.5,
-            "last5_pra": PLAYER_STATS[player_id]["last5_avg"] + 14.3,
-            "last10_points": PLAYER_STATS[player_id]["last10_avg"],
-            "last10_rebounds": 7.6,
-            "last10_assists": 6.3,
-            "last10_pra": PLAYER_STATS[player_id]["last10_avg"] + 13.9,
-        },
+        "player": player,
+        "season_averages": SEASON_AVERAGES[player_id],
+        "rolling_averages": ROLLING_AVERAGES[player_id],
         "game_logs": game_logs,
         "current_lines": current_lines,
     }
 
 
+@app.get("/api/player/{player_id}")
+def get_player_detail(player_id: int):
+    """Get player detail."""
+    if player_id not in DETAIL_PLAYERS:
+        raise HTTPException(status_code=404, detail="Player not found")
+    return _build_player_detail(player_id, datetime.now().strftime("%Y-%m-%d"))
+
+
+@app.get("/api/players/batch")
+def get_players_batch(ids: str):
+    """Get detail for several players in one call, e.g. ?ids=1,2,3. Unknown ids are skipped."""
+    try:
+        player_ids = [int(pid) for pid in ids.split(",") if pid.strip()]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be a comma-separated list of integers")
+
+    today = datetime.now().strftime("%Y-%m-%d")
+    return {
+        "players": {
+            str(pid): _build_player_detail(pid, today)
+            for pid in dict.fromkeys(player_ids)
+            if pid in DETAIL_PLAYERS
+        }
+    }
+
+
 if __name__ == "__main__":
+    import os
+    import sys
     import uvicorn
     print("🏀 Starting VisBets MVP Simple Server on http://localhost:8000")
     print("📖 API Docs: http://localhost:8000/docs")
     print("🎯 Test slate: http://localhost:8000/api/slate")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # One worker per CPU (workers need an import string); uvloop has no Windows build
+    uvicorn.run(
+        "simple_server:app",
+        app_dir=os.path.dirname(os.path.abspath(__file__)),
+        host="0.0.0.0",
+        port=8000,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        workers=os.cpu_count() or 1,
+        access_log=False,
+    )
@@ -0,0 +1,46 @@
+import copy
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture(scope="session")
+def client():
+    """One TestClient for the whole session, so app startup/shutdown runs once."""
+    # Imported lazily: app.main requires NBA_API_KEY at import time
+    from app.main import app
+
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def preprocessor():
+    """Fresh DataPreprocessor; tests fit it, so it is not shared."""
+    from app.models.data_prep import DataPreprocessor
+
+    return DataPreprocessor()
+
+
+@pytest.fixture(scope="session")
+def ensemble_training_data():
+    """Seeded (X, y) game features and targets for fitting the ensemble."""
+    import numpy as np
+
+    X = np.random.default_rng(0).uniform(0, 30, size=(40, 8))
+    return X, X[:, :3] * 0.5
+
+
+@pytest.fixture(scope="session")
+def trained_ensemble(ensemble_training_data):
+    """EnsemblePredictor fitted once per session (once per xdist worker)."""
+    from app.models.ensemble import EnsemblePredictor
+
+    ensemble = EnsemblePredictor()
+    ensemble.fit(*ensemble_training_data)
+    return ensemble
+
+
+@pytest.fixture
+def ensemble(trained_ensemble):
+    """Private copy of the fitted ensemble, so weight changes and cached predictions don't leak between tests."""
+    return copy.deepcopy(trained_ensemble)
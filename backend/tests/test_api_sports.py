@@ -1,5 +1,6 @@
 import pytest
-from unittest.mock import Mock, patch
+import httpx
+import respx
 from app.services.api_sports import APISportsService
 from app.utils.api_helpers import get_api_headers
 
@@ -18,33 +19,35 @@ def mock_response():
         ]
     }
 
+@pytest.fixture
+def api_sports_mock():
+    # Answers the service's httpx client at the transport layer; nothing reaches the network
+    with respx.mock(base_url=APISportsService.BASE_URL, assert_all_called=False) as mock:
+        yield mock
+
 @pytest.mark.asyncio
-async def test_get_player_stats(mock_response):
-    with patch('httpx.AsyncClient.get') as mock_get:
-        mock_get.return_value = Mock(
-            status_code=200,
-            json=lambda: mock_response
-        )
-        
-        service = APISportsService()
-        result = await service.get_player_stats(1)
-        
-        assert result == mock_response
-        mock_get.assert_called_once()
+async def test_get_player_stats(api_sports_mock, mock_response):
+    route = api_sports_mock.get("/players/statistics").mock(
+        return_value=httpx.Response(200, json=mock_response)
+    )
+    
+    service = APISportsService()
+    result = await service.get_player_stats(1)
+    
+    assert result == mock_response
+    assert route.call_count == 1
 
 @pytest.mark.asyncio
-async def test_get_player_info(mock_response):
-    with patch('httpx.AsyncClient.get') as mock_get:
-        mock_get.return_value = Mock(
-            status_code=200,
-            json=lambda: mock_response
-        )
-        
-        service = APISportsService()
-        result = await service.get_player_info(1)
-        
-        assert result == mock_response
-        mock_get.assert_called_once()
+async def test_get_player_info(api_sports_mock, mock_response):
+    route = api_sports_mock.get("/players").mock(
+        return_value=httpx.Response(200, json=mock_response)
+    )
+    
+    service = APISportsService()
+    result = await service.get_player_info(1)
+    
+    assert result == mock_response
+    assert route.call_count == 1
 
 @pytest.mark.asyncio
 async def test_api_headers():
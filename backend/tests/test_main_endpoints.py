@@ -1,14 +1,9 @@
 import pytest
-from fastapi.testclient import TestClient
 from unittest.mock import AsyncMock, patch, MagicMock
-from app.main import app
 from app.config import Settings
 from sqlalchemy.ext.asyncio import AsyncSession
 import json
 
-# Test client
-client = TestClient(app)
-
 # Mock data
 MOCK_PLAYER = {
     "id": 2544,
@@ -35,7 +30,7 @@ MOCK_TEAM = {
 def mock_db():
     return AsyncMock(spec=AsyncSession)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_settings():
     return Settings(
         API_SPORTS_KEY="test_key",
@@ -43,14 +38,14 @@ def mock_settings():
     )
 
 # Test Root Endpoint
-def test_root():
+def test_root(client):
     """Test root endpoint"""
     response = client.get("/")
     assert response.status_code == 200
     assert response.json() == {"status": "VisBets API Running"}
 
 # Test Teams Endpoint
-def test_get_teams(mock_db):
+def test_get_teams(client, mock_db):
     """Test getting all teams"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/teams")
@@ -59,7 +54,7 @@ def test_get_teams(mock_db):
         assert isinstance(data, list)
 
 # Test Players Endpoint
-def test_get_players(mock_db):
+def test_get_players(client, mock_db):
     """Test getting players with pagination"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/players?page=1&per_page=20")
@@ -69,7 +64,7 @@ def test_get_players(mock_db):
         assert "pagination" in data
 
 # Test Player Details Endpoint
-def test_get_player_details(mock_db):
+def test_get_player_details(client, mock_db):
     """Test getting player details"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/players/2544/details")
@@ -81,7 +76,7 @@ def test_get_player_details(mock_db):
         assert "predictions" in data
 
 # Test Team Details Endpoint
-def test_get_team_details(mock_db):
+def test_get_team_details(client, mock_db):
     """Test getting team details"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/teams/14")
@@ -92,7 +87,7 @@ def test_get_team_details(mock_db):
         assert "roster" in data
 
 # Test Top Scorers Endpoint
-def test_get_top_scorers(mock_db):
+def test_get_top_scorers(client, mock_db):
     """Test getting top scorers"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/top-scorers?limit=20")
@@ -102,7 +97,7 @@ def test_get_top_scorers(mock_db):
         assert len(data) <= 20
 
 # Test Model Training Endpoint
-def test_train_models():
+def test_train_models(client):
     """Test model training endpoint"""
     response = client.post("/train")
     assert response.status_code == 200
@@ -111,7 +106,7 @@ def test_train_models():
     assert "Training started in background" in data["message"]
 
 # Test Database Initialization
-def test_initialize_database(mock_db):
+def test_initialize_database(client, mock_db):
     """Test database initialization"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/init-db")
@@ -121,18 +116,18 @@ def test_initialize_database(mock_db):
         assert data["status"] in ["success", "info"]
 
 # Test Error Handling
-def test_invalid_player_id():
+def test_invalid_player_id(client):
     """Test handling of invalid player ID"""
     response = client.get("/players/invalid")
     assert response.status_code in [400, 404]
 
-def test_invalid_team_id():
+def test_invalid_team_id(client):
     """Test handling of invalid team ID"""
     response = client.get("/teams/invalid")
     assert response.status_code in [400, 404]
 
 # Test Pagination
-def test_players_pagination(mock_db):
+def test_players_pagination(client, mock_db):
     """Test players endpoint pagination"""
     with patch("app.main.get_async_db", return_value=mock_db):
         # Test first page
@@ -151,7 +146,7 @@ def test_players_pagination(mock_db):
         assert data1["players"] != data2["players"]
 
 # Test API Configuration
-def test_api_configuration(mock_settings):
+def test_api_configuration(client, mock_settings):
     """Test API configuration endpoint"""
     with patch("app.main.get_settings", return_value=mock_settings):
         response = client.get("/test-api")
@@ -161,7 +156,7 @@ def test_api_configuration(mock_settings):
         assert "api_host" in data
 
 # Test CORS
-def test_cors_headers():
+def test_cors_headers(client):
     """Test CORS headers"""
     response = client.options("/")
     assert response.status_code == 200
@@ -171,7 +166,7 @@ def test_cors_headers():
 
 # Test Cache Management
 @pytest.mark.asyncio
-async def test_cache_management(mock_db):
+async def test_cache_management(client, mock_db):
     """Test cache management"""
     with patch("app.main.get_async_db", return_value=mock_db):
         # Test cached response
@@ -183,7 +178,7 @@ async def test_cache_management(mock_db):
         pass
 
 # Test Background Tasks
-def test_background_tasks():
+def test_background_tasks(client):
     """Test background tasks"""
     # Test model training background task
     response = client.post("/train")
@@ -192,7 +187,7 @@ def test_background_tasks():
 
 # Test Database Session Management
 @pytest.mark.asyncio
-async def test_database_session(mock_db):
+async def test_database_session(client, mock_db):
     """Test database session management"""
     with patch("app.main.get_async_db", return_value=mock_db):
         response = client.get("/teams")
@@ -0,0 +1,178 @@
+import json
+import pytest
+import numpy as np
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from app.db.models import Base, Player, Game, PlayerGameStats, PlayerMetrics, SportsbookLine
+from app.services import metrics_service
+from app.services.metrics_service import MARKETS, MetricsService, averages_query, season_bounds
+
+SEASON = "2024-25"
+SEASON_END = datetime(2025, 4, 10)
+
+@pytest.fixture
+def db_path(tmp_path):
+    """SQLite file seeded with two players' game logs (newest game first per player)."""
+    path = tmp_path / "metrics.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+
+    rng = np.random.default_rng(7)
+    games = [
+        {"id": i + 1, "date": SEASON_END - timedelta(days=2 * i), "home_team": "LAL", "away_team": "BOS", "status": "finished"}
+        for i in range(12)
+    ]
+    # One game from the previous season, which only the season window should skip
+    games.append({"id": 13, "date": datetime(2024, 4, 1), "home_team": "LAL", "away_team": "BOS", "status": "finished"})
+
+    stats = []
+    for player_id in (1, 2):
+        for game in games:
+            points, rebounds, assists = rng.integers(0, 40, size=3).tolist()
+            stats.append({
+                "player_id": player_id, "game_id": game["id"], "date": game["date"],
+                "points": points, "rebounds": rebounds, "assists": assists,
+            })
+
+    with Session(engine) as db:
+        db.execute(insert(Player), [
+            {"id": 1, "first_name": "Test", "last_name": "One", "full_name": "Test One"},
+            {"id": 2, "first_name": "Test", "last_name": "Two", "full_name": "Test Two"},
+        ])
+        db.execute(insert(Game), games)
+        db.execute(insert(PlayerGameStats), stats)
+        db.commit()
+    engine.dispose()
+    return path
+
+def python_averages(path, player_id):
+    """Reference averages computed in Python from the raw rows, newest game first."""
+    engine = create_engine(f"sqlite:///{path}")
+    with Session(engine) as db:
+        rows = db.query(PlayerGameStats).filter_by(player_id=player_id).order_by(PlayerGameStats.date.desc()).all()
+    engine.dispose()
+
+    start, end = season_bounds(SEASON)
+    a = np.array([[r.points, r.rebounds, r.assists] for r in rows], dtype=np.float64)
+    a = np.column_stack((a, a.sum(axis=1)))
+    in_season = np.array([start <= r.date < end for r in rows])
+    return {
+        "season": a[in_season].mean(axis=0),
+        "last5": a[:5].mean(axis=0),
+        "last10": a[:10].mean(axis=0),
+    }, int(in_season.sum())
+
+def test_averages_query_matches_python(db_path):
+    """SQL window aggregation matches the per-player Python means for every window and market"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as db:
+        rows = {row.player_id: row._mapping for row in db.execute(averages_query(season=SEASON))}
+    engine.dispose()
+
+    assert set(rows) == {1, 2}
+    for player_id, row in rows.items():
+        expected, games_played = python_averages(db_path, player_id)
+        assert row["games_played"] == games_played == 12
+        for window, means in expected.items():
+            actual = [row[f"{window}_{market}"] for market in MARKETS]
+            np.testing.assert_allclose(actual, means)
+
+def test_averages_query_unknown_season():
+    """Malformed season labels are rejected"""
+    with pytest.raises(ValueError):
+        averages_query(season="2024")
+
+@pytest.mark.asyncio
+async def test_stale_metrics_fall_back_to_sql(db_path):
+    """A player_metrics row older than the player's stats is ignored"""
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as db:
+        db.execute(insert(PlayerMetrics), [{
+            "player_id": 1, "updated_at": datetime(2025, 1, 1),
+            **{f"{window}_{market}": -1.0 for window in ("season", "last5", "last10") for market in MARKETS},
+        }])
+        db.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with AsyncSession(async_engine) as adb:
+            fresh = await MetricsService.get_market_averages(adb, 1)
+            assert fresh["last5"].tolist() == [-1.0] * len(MARKETS)
+
+            db.execute(update(Player).where(Player.id == 1).values(stats_updated_at=datetime(2025, 2, 1)))
+            db.commit()
+
+            stale = await MetricsService.get_market_averages(adb, 1)
+            expected, _ = python_averages(db_path, 1)
+            np.testing.assert_allclose(stale["last5"], expected["last5"])
+        await async_engine.dispose()
+    engine.dispose()
+
+@pytest.mark.asyncio
+async def test_no_current_season_games_gives_none(db_path):
+    """A player whose games all predate the current season gets None, not NaN, season figures"""
+    line_date = datetime(2026, 1, 15)
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as db:
+        db.execute(insert(SportsbookLine), [{"player_id": 1, "date": line_date, "market": "points", "line_value": 20.5}])
+        db.commit()
+    engine.dispose()
+
+    # The fixture's games end in April 2025, so current_season() finds none of them
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with AsyncSession(async_engine) as adb:
+        markets = (await MetricsService.get_players_markets_data(adb, [1], line_date))[1]
+    await async_engine.dispose()
+
+    assert len(markets) == 1
+    market = markets[0]
+    assert market["season_avg"] is None
+    assert market["delta_line_vs_season"] is None
+    assert market["pct_diff_line_vs_season"] is None
+    assert market["last5_avg"] is not None
+    json.dumps(markets, allow_nan=False)
+
+@pytest.mark.asyncio
+async def test_game_logs_newest_first(db_path):
+    """Game logs come back newest first with ISO dates and summed PRA"""
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    async with AsyncSession(async_engine) as adb:
+        logs = await MetricsService.get_game_logs(adb, 1, limit=3)
+    await async_engine.dispose()
+
+    assert [log["date"] for log in logs] == ["2025-04-10", "2025-04-08", "2025-04-06"]
+    assert all(log["pra"] == log["points"] + log["rebounds"] + log["assists"] for log in logs)
+
+@pytest.mark.asyncio
+async def test_averages_cached_per_stats_version(db_path):
+    """Averages are reused while stats_updated_at is unchanged and reread once it moves"""
+    metrics_service._averages_cache.clear()
+    metrics_row = {
+        "player_id": 2, "updated_at": datetime(2025, 3, 2),
+        **{f"{window}_{market}": 1.0 for window in ("season", "last5", "last10") for market in MARKETS},
+    }
+    engine = create_engine(f"sqlite:///{db_path}")
+    with Session(engine) as db:
+        db.execute(update(Player).where(Player.id == 2).values(stats_updated_at=datetime(2025, 3, 1)))
+        db.execute(insert(PlayerMetrics), [metrics_row])
+        db.commit()
+
+        async_engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+        async with AsyncSession(async_engine) as adb:
+            first = await MetricsService.get_market_averages(adb, 2)
+            assert first["last5"].tolist() == [1.0] * len(MARKETS)
+
+            # Same stats version: the changed metrics row is not read again
+            db.execute(update(PlayerMetrics).where(PlayerMetrics.player_id == 2).values(last5_points=2.0))
+            db.commit()
+            assert (await MetricsService.get_market_averages(adb, 2)) is first
+
+            # A new stats version misses the cache and rereads the (refreshed) metrics row
+            db.execute(update(Player).where(Player.id == 2).values(stats_updated_at=datetime(2025, 3, 3)))
+            db.commit()
+            reread = await MetricsService.get_market_averages(adb, 2)
+            assert reread["last5"].tolist() == [2.0] + [1.0] * (len(MARKETS) - 1)
+        await async_engine.dispose()
+    engine.dispose()
+    metrics_service._averages_cache.clear()
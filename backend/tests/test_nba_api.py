@@ -1,18 +1,15 @@
 import pytest
-from fastapi.testclient import TestClient
 import fastapi.testclient
 print("FASTAPI TESTCLIENT FILE:", fastapi.testclient.__file__)
 from unittest.mock import AsyncMock, patch, MagicMock
 import json
 from datetime import datetime
 import asyncio
-from app.main import app
+import logging
+import websockets
 from app.services.nba_service import NBAGameService
 from app.config import Settings
 
-# Test client
-client = TestClient(app)
-
 # Mock data
 MOCK_GAME_DATA = {
     "type": "gi",
@@ -47,7 +44,7 @@ MOCK_EVENT = {
     "description": "3-point field goal made"
 }
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_settings():
     return Settings(
         NBA_API_KEY="test_key",
@@ -60,8 +57,16 @@ def mock_nba_service():
     service.websocket = AsyncMock()
     return service
 
+async def run_messages(service, messages):
+    """Feed raw messages through the reader and worker tasks until every one is handled."""
+    service.websocket.recv.side_effect = [*messages, websockets.exceptions.ConnectionClosed(None, None)]
+    service._start_tasks()
+    await service._tasks[0]
+    await asyncio.gather(*(queue.join() for queue in service._queues))
+    await service.disconnect()
+
 # Test NBA API Configuration
-def test_nba_api_configuration():
+def test_nba_api_configuration(client):
     """Test NBA API configuration loading"""
     response = client.get("/test-nba-api")
     assert response.status_code == 200
@@ -71,7 +76,7 @@ def test_nba_api_configuration():
 
 # Test WebSocket Connection
 @pytest.mark.asyncio
-async def test_websocket_connection(mock_nba_service):
+async def test_websocket_connection(client, mock_nba_service):
     """Test WebSocket connection and message handling"""
     with patch("app.routers.nba.NBAGameService", return_value=mock_nba_service):
         with client.websocket_connect("/api/nba/ws/12345") as websocket:
@@ -82,7 +87,7 @@ async def test_websocket_connection(mock_nba_service):
             assert data["gameId"] == "12345"
 
 # Test Game Info Endpoint
-def test_get_game_info(mock_nba_service):
+def test_get_game_info(client, mock_nba_service):
     """Test getting game information"""
     with patch("app.routers.nba.NBAGameService", return_value=mock_nba_service):
         response = client.get("/api/nba/game/12345")
@@ -91,7 +96,7 @@ def test_get_game_info(mock_nba_service):
         assert isinstance(data, dict)
 
 # Test Team Stats Endpoint
-def test_get_team_stats(mock_nba_service):
+def test_get_team_stats(client, mock_nba_service):
     """Test getting team statistics"""
     with patch("app.routers.nba.NBAGameService", return_value=mock_nba_service):
         response = client.get("/api/nba/game/12345/stats")
@@ -125,11 +130,11 @@ async def test_nba_service_message_handling(mock_nba_service):
         assert data["type"] == "gi"
     
     mock_nba_service.register_handler("gi", test_handler)
-    await mock_nba_service._listen_for_messages()
+    await run_messages(mock_nba_service, [json.dumps(MOCK_GAME_DATA)])
     assert handler_called
 
 # Test Error Handling
-def test_invalid_game_id():
+def test_invalid_game_id(client):
     """Test handling of invalid game ID"""
     response = client.get("/api/nba/game/invalid")
     assert response.status_code in [400, 404]
@@ -137,9 +142,13 @@ def test_invalid_game_id():
 @pytest.mark.asyncio
 async def test_websocket_error_handling(mock_nba_service):
     """Test WebSocket error handling"""
+    handler = AsyncMock()
+    mock_nba_service.register_handler("gi", handler)
     mock_nba_service.websocket.recv.side_effect = Exception("Connection error")
-    with pytest.raises(Exception):
-        await mock_nba_service._listen_for_messages()
+    mock_nba_service._running = True
+    # The reader stops on a socket error instead of raising into its task
+    await mock_nba_service._listen_for_messages()
+    assert not handler.called
 
 # Test Message Types
 @pytest.mark.asyncio
@@ -154,8 +163,7 @@ async def test_game_info_message(mock_nba_service):
         assert "gameId" in data
     
     mock_nba_service.register_handler("gi", test_handler)
-    mock_nba_service.websocket.recv.return_value = json.dumps(MOCK_GAME_DATA)
-    await mock_nba_service._listen_for_messages()
+    await run_messages(mock_nba_service, [json.dumps(MOCK_GAME_DATA)])
     assert handler_called
 
 @pytest.mark.asyncio
@@ -171,8 +179,7 @@ async def test_team_stats_message(mock_nba_service):
         assert "awayTeam" in data
     
     mock_nba_service.register_handler("te", test_handler)
-    mock_nba_service.websocket.recv.return_value = json.dumps(MOCK_TEAM_STATS)
-    await mock_nba_service._listen_for_messages()
+    await run_messages(mock_nba_service, [json.dumps(MOCK_TEAM_STATS)])
     assert handler_called
 
 @pytest.mark.asyncio
@@ -188,8 +195,7 @@ async def test_event_message(mock_nba_service):
         assert "description" in data
     
     mock_nba_service.register_handler("ev", test_handler)
-    mock_nba_service.websocket.recv.return_value = json.dumps(MOCK_EVENT)
-    await mock_nba_service._listen_for_messages()
+    await run_messages(mock_nba_service, [json.dumps(MOCK_EVENT)])
     assert handler_called
 
 # Test Configuration Loading
@@ -200,7 +206,7 @@ def test_settings_loading(mock_settings):
 
 # Test WebSocket Connection Management
 @pytest.mark.asyncio
-async def test_websocket_connection_management():
+async def test_websocket_connection_management(client):
     """Test WebSocket connection management"""
     with client.websocket_connect("/api/nba/ws/12345") as websocket:
         # Test connection is established
@@ -224,13 +230,47 @@ async def test_multiple_message_types(mock_nba_service):
     mock_nba_service.register_handler("ev", test_handler)
     
     # Simulate receiving multiple message types
-    mock_nba_service.websocket.recv.side_effect = [
+    await run_messages(mock_nba_service, [
         json.dumps(MOCK_GAME_DATA),
         json.dumps(MOCK_TEAM_STATS),
         json.dumps(MOCK_EVENT)
+    ])
+    assert messages_received == ["gi", "te", "ev"]
+
+# Test Ordering And Backpressure
+@pytest.mark.asyncio
+async def test_game_messages_handled_in_order():
+    """Updates for one game are applied in arrival order, even across workers"""
+    service = NBAGameService(api_key="test_key", num_workers=4)
+    service.websocket = AsyncMock()
+    scores = []
+
+    async def slow_handler(data):
+        # Earlier messages take longer, so any reordering would show up
+        await asyncio.sleep(0.01 * (5 - data["score"]["home"]))
+        scores.append(data["score"]["home"])
+
+    service.register_handler("sc", slow_handler)
+    messages = [json.dumps({"type": "sc", "gameId": "12345", "score": {"home": i}}) for i in range(5)]
+    await run_messages(service, messages)
+    assert scores == list(range(5))
+
+@pytest.mark.asyncio
+async def test_full_queue_drops_oldest(caplog):
+    """A full queue drops its oldest message and logs it"""
+    service = NBAGameService(api_key="test_key", queue_size=2)
+    service.websocket = AsyncMock()
+    service.websocket.recv.side_effect = [
+        *(json.dumps({"type": "sc", "gameId": "12345", "seq": i}) for i in range(3)),
+        websockets.exceptions.ConnectionClosed(None, None),
     ]
-    
-    await mock_nba_service._listen_for_messages()
-    assert "gi" in messages_received
-    assert "te" in messages_received
-    assert "ev" in messages_received 
\ No newline at end of file
+    service.register_handler("sc", AsyncMock())
+    service._running = True
+
+    # Read without workers so the queue fills up
+    with caplog.at_level(logging.WARNING, logger="app.services.nba_service"):
+        await service._listen_for_messages()
+
+    queued = [service._queues[0].get_nowait()["seq"] for _ in range(service._queues[0].qsize())]
+    assert queued == [1, 2]
+    assert "dropped oldest sc message" in caplog.text 
\ No newline at end of file
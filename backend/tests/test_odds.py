@@ -0,0 +1,90 @@
+import pytest
+import asyncio
+from app.utils import odds
+from app.utils.odds import OddsAPI, OddsComparison
+
+MOCK_GAMES = [
+    {
+        "commence_time": "2024-01-15T00:00:00Z",
+        "home_team": "Los Angeles Lakers",
+        "away_team": "Boston Celtics",
+        "bookmakers": [
+            {
+                "title": "DraftKings",
+                "markets": [
+                    {
+                        "key": "player_props",
+                        "outcomes": [
+                            {"name": f"Player {i}", "description": "Points", "price": 20.5 + i}
+                            for i in range(5)
+                        ]
+                    }
+                ]
+            }
+        ]
+    }
+]
+
+@pytest.fixture
+def odds_api(monkeypatch, tmp_path):
+    monkeypatch.setenv("ODDS_API_KEY", "test_key")
+    monkeypatch.setattr(odds, "ODDS_CACHE_PATH", str(tmp_path / "odds_cache.sqlite"))
+    return OddsAPI()
+
+@pytest.mark.asyncio
+async def test_compare_predictions_order_and_concurrency(odds_api):
+    """Results come back in item order and never exceed max_concurrency in flight"""
+    active = 0
+    peak = 0
+
+    async def aget_player_props(player_name):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        # Later items finish first, so gather order is what keeps results ordered
+        await asyncio.sleep(0.01 * (5 - int(player_name[-1])))
+        active -= 1
+        return {
+            "game_time": "2024-01-15T00:00:00Z", "home_team": "LAL", "away_team": "BOS",
+            "bookmaker": "DraftKings", "prop_type": "Points", "line": 20.0,
+            "over_odds": None, "under_odds": None,
+        }
+
+    odds_api.aget_player_props = aget_player_props
+    comparison = OddsComparison(odds_api)
+    items = [(f"Player {i}", 25.0, "points") for i in range(5)]
+
+    results = await comparison.compare_predictions(items, max_concurrency=2)
+
+    assert [r["player"] for r in results] == [name for name, _, _ in items]
+    assert peak == 2
+    assert all(r["recommendation"] == "over" for r in results)
+
+@pytest.mark.asyncio
+async def test_compare_predictions_share_one_slate_fetch(odds_api):
+    """Concurrent lookups on a cold cache coalesce into a single slate request"""
+    calls = 0
+
+    async def request_games():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return MOCK_GAMES
+
+    odds_api._request_games = request_games
+    comparison = OddsComparison(odds_api)
+    items = [(f"Player {i}", 10.0, "points") for i in range(5)]
+
+    results = await comparison.compare_predictions(items)
+
+    assert calls == 1
+    assert [r["betting_line"] for r in results] == [20.5 + i for i in range(5)]
+    assert all(r["recommendation"] == "under" for r in results)
+
+@pytest.mark.asyncio
+async def test_close_releases_session(odds_api):
+    """close() closes the shared aiohttp session"""
+    session = await odds_api._get_session()
+    await odds_api.close()
+    assert session.closed
+    assert odds_api._session is None
@@ -1,7 +1,5 @@
 import pytest
 import numpy as np
-from app.models.data_prep import DataPreprocessor
-from app.models.ensemble import EnsemblePredictor
 
 @pytest.fixture
 def sample_data():
@@ -23,8 +21,7 @@ def sample_data():
         'free_throws_attempted': 3
     }
 
-def test_data_preprocessor(sample_data):
-    preprocessor = DataPreprocessor()
+def test_data_preprocessor(sample_data, preprocessor):
     
     # Test feature preparation
     features = preprocessor.prepare_single_player(sample_data)
@@ -32,13 +29,24 @@ def test_data_preprocessor(sample_data):
     
     # Test normalization
     X = np.array([[1, 2, 3], [4, 5, 6]])
+    preprocessor.fit(X)
     X_normalized, ranges = preprocessor.normalize_features(X)
     assert X_normalized.shape == X.shape
+    assert X.tolist() == [[1, 2, 3], [4, 5, 6]]  # the input is left untouched
     assert all(0 <= x <= 1 for x in X_normalized.flatten())
+    assert ranges[0] == {'min': 1.0, 'max': 4.0}
+    
+    # Float input is not overwritten either
+    X_float = np.array([[2.5, 2.0, 6.0]])
+    preprocessor.normalize_features(X_float)
+    assert X_float.tolist() == [[2.5, 2.0, 6.0]]
+    
+    # Fitted ranges are reused on new data, written into a caller-supplied buffer
+    out = np.empty((1, 3))
+    preprocessor.transform_into(np.array([[2.5, 2, 6]]), out)
+    np.testing.assert_allclose(out, [[0.5, 0, 1]])
 
-def test_ensemble_predictor(sample_data):
-    preprocessor = DataPreprocessor()
-    ensemble = EnsemblePredictor()
+def test_ensemble_predictor(sample_data, preprocessor, ensemble):
     
     # Prepare sample data
     features = preprocessor.prepare_single_player(sample_data)
@@ -57,8 +65,7 @@ def test_ensemble_predictor(sample_data):
     ensemble.update_weights(new_weights)
     assert ensemble.weights == new_weights
 
-def test_invalid_weights():
-    ensemble = EnsemblePredictor()
+def test_invalid_weights(ensemble):
     invalid_weights = {
         'neural_net': 0.5,
         'xgboost': 0.3,
@@ -66,4 +73,37 @@ def test_invalid_weights():
     }
     
     with pytest.raises(ValueError):
-        ensemble.update_weights(invalid_weights) 
\ No newline at end of file
+        ensemble.update_weights(invalid_weights) 
+def test_ensemble_blends_fitted_models(ensemble, ensemble_training_data):
+    X, _ = ensemble_training_data
+    
+    games = [dict(zip(['points', 'assists', 'totReb', 'minutes', 'fgm', 'fga', 'ftm', 'fta'], row)) for row in X[:5]]
+    ensemble.update_weights({'rf': 0.75, 'nn': 0.25})
+    prediction = ensemble.predict(games)
+    
+    # Weighted blend of each model's last-game prediction, per target
+    features = ensemble.prepare_features(games)
+    expected = 0.75 * ensemble.models['rf'].predict(features)[-1] + 0.25 * ensemble.models['nn'].predict(features)[-1]
+    np.testing.assert_allclose([prediction[stat] for stat in ('points', 'assists', 'rebounds')], expected)
+
+def test_ensemble_float32_parity(ensemble, ensemble_training_data):
+    X, _ = ensemble_training_data
+    
+    # float32 inference matches float64 inputs to within 1e-3
+    for model in ensemble.models.values():
+        np.testing.assert_allclose(
+            model.predict(X.astype(np.float32)), model.predict(X), rtol=1e-3, atol=1e-3
+        )
+    assert ensemble.models['nn'].coefs_[0].dtype == np.float32
+
+def test_ensemble_memoizes_predictions(ensemble):
+    games = [{'points': 25, 'assists': 7, 'totReb': 8, 'minutes': 35}]
+    
+    first = ensemble.predict(games)
+    ensemble.models['rf'].predict = lambda X: pytest.fail("cached prediction should skip the models")
+    assert ensemble.predict(games) == first
+    
+    # New weights invalidate the cache
+    del ensemble.models['rf'].predict
+    ensemble.update_weights({'rf': 0.9, 'nn': 0.1})
+    assert ensemble.predict(games) != first
@@ -1,56 +1,76 @@
+import io
+import joblib
 import pytest
 from unittest.mock import AsyncMock, patch, MagicMock
 from app.services.prediction_service import PredictionService
 import numpy as np
 import pandas as pd
-
-@pytest.fixture
+from sklearn.metrics import r2_score
+
+PLAYER_COLUMNS = [
+    "points", "assists", "rebounds", "minutes",
+    "fieldGoalsMade", "fieldGoalsAttempted",
+    "threePointersMade", "threePointersAttempted",
+    "freeThrowsMade", "freeThrowsAttempted",
+    "offensiveRebounds", "defensiveRebounds",
+    "steals", "blocks", "turnovers", "fouls",
+]
+PLAYER_DTYPE = np.dtype([(col, "f4") for col in PLAYER_COLUMNS])
+
+# Game-line columns in EnsemblePredictor.prepare_features order, and its targets
+ENSEMBLE_FEATURES = [PLAYER_COLUMNS.index(col) for col in (
+    "points", "assists", "rebounds", "minutes",
+    "fieldGoalsMade", "fieldGoalsAttempted", "freeThrowsMade", "freeThrowsAttempted",
+)]
+ENSEMBLE_TARGETS = [PLAYER_COLUMNS.index(col) for col in ("points", "assists", "rebounds")]
+
+INVALID_PLAYER_DATA = [{"invalid": "data"}]
+
+@pytest.fixture(scope="module")
 def prediction_service():
     return PredictionService()
 
-@pytest.fixture
-def mock_player_data():
-    return [
-        {
-            "points": 25,
-            "assists": 7,
-            "rebounds": 8,
-            "minutes": 35,
-            "fieldGoalsMade": 10,
-            "fieldGoalsAttempted": 20,
-            "threePointersMade": 3,
-            "threePointersAttempted": 8,
-            "freeThrowsMade": 2,
-            "freeThrowsAttempted": 3,
-            "offensiveRebounds": 2,
-            "defensiveRebounds": 6,
-            "steals": 1,
-            "blocks": 1,
-            "turnovers": 3,
-            "fouls": 2
-        }
-    ]
+@pytest.fixture(scope="module")
+def player_record():
+    """One player's game line as a float32 structured array (one record, fields in PLAYER_COLUMNS order)"""
+    record = np.zeros(1, dtype=PLAYER_DTYPE)
+    record[0] = (25, 7, 8, 35, 10, 20, 3, 8, 2, 3, 2, 6, 1, 1, 3, 2)
+    return record
+
+@pytest.fixture(scope="module")
+def player_frame(player_record):
+    """The same game line as a DataFrame, built straight from the typed record"""
+    return pd.DataFrame(player_record)
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def mock_player_data(player_frame):
+    """The same game line in the raw JSON (list of dicts) shape the service accepts"""
+    return player_frame.to_dict("records")
+
+@pytest.fixture(scope="session")
 def mock_training_data():
-    return pd.DataFrame({
-        'points': np.random.normal(20, 5, 100),
-        'assists': np.random.normal(5, 2, 100),
-        'rebounds': np.random.normal(7, 3, 100),
-        'minutes': np.random.normal(30, 5, 100),
-        'fieldGoalsMade': np.random.normal(8, 3, 100),
-        'fieldGoalsAttempted': np.random.normal(16, 4, 100),
-        'threePointersMade': np.random.normal(2, 1, 100),
-        'threePointersAttempted': np.random.normal(6, 2, 100),
-        'freeThrowsMade': np.random.normal(3, 1, 100),
-        'freeThrowsAttempted': np.random.normal(4, 1, 100),
-        'offensiveRebounds': np.random.normal(1, 1, 100),
-        'defensiveRebounds': np.random.normal(5, 2, 100),
-        'steals': np.random.normal(1, 0.5, 100),
-        'blocks': np.random.normal(0.5, 0.5, 100),
-        'turnovers': np.random.normal(2, 1, 100),
-        'fouls': np.random.normal(2, 1, 100)
-    })
+    """100 seeded game lines, drawn in one call into one contiguous block (columns as PLAYER_COLUMNS)"""
+    means = np.array([20, 5, 7, 30, 8, 16, 2, 6, 3, 4, 1, 5, 1, 0.5, 2, 2], dtype=np.float64)
+    stds = np.array([5, 2, 3, 5, 3, 4, 1, 2, 1, 1, 1, 2, 0.5, 0.5, 1, 1], dtype=np.float64)
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(rng.normal(means, stds, size=(100, len(PLAYER_COLUMNS))), columns=PLAYER_COLUMNS, copy=False)
+
+@pytest.fixture(scope="session")
+def training_split(mock_training_data):
+    """(train, test) row views of the training block; the last 20 rows are held out for evaluation"""
+    values = mock_training_data.to_numpy()
+    return values[:80], values[80:]
+
+def ensemble_inputs(rows):
+    """(X, y) for EnsemblePredictor.fit/model.predict from rows of game lines"""
+    return rows[:, ENSEMBLE_FEATURES].astype(np.float32), rows[:, ENSEMBLE_TARGETS]
+
+@pytest.fixture(scope="session")
+def trained_service(training_split):
+    """PredictionService with its ensemble fitted once, shared by every test that only reads from it"""
+    service = PredictionService()
+    service.ensemble.fit(*ensemble_inputs(training_split[0]))
+    return service
 
 # Test Prediction Service Initialization
 def test_prediction_service_init(prediction_service):
@@ -67,102 +87,97 @@ def test_train_models(prediction_service, mock_training_data):
     assert len(prediction_service.models) > 0
 
 # Test Predictions
-def test_predict(prediction_service, mock_player_data):
+def test_predict(trained_service, mock_player_data):
     """Test making predictions"""
-    predictions = prediction_service.predict(mock_player_data)
+    predictions = trained_service.predict(mock_player_data)
     assert isinstance(predictions, dict)
     assert "points" in predictions
     assert "assists" in predictions
     assert "rebounds" in predictions
-    assert all(isinstance(v, (int, float)) for v in predictions.values())
-
-# Test Data Preprocessing
-def test_preprocess_data(prediction_service, mock_player_data):
-    """Test data preprocessing"""
-    processed_data = prediction_service._preprocess_data(mock_player_data)
-    assert isinstance(processed_data, pd.DataFrame)
-    assert not processed_data.empty
-    assert all(col in processed_data.columns for col in [
-        'points', 'assists', 'rebounds', 'minutes',
-        'fieldGoalsMade', 'fieldGoalsAttempted'
-    ])
+    # One dtype read instead of a per-value isinstance; "context" holds metadata, not numbers
+    values = np.array([predictions[stat] for stat in ("points", "assists", "rebounds")])
+    assert values.dtype.kind in "fi"
+
+# Test Input Processing and Validation
+def assert_game_frame(result):
+    """A non-empty float32 frame with every game-line column, in order"""
+    assert isinstance(result, pd.DataFrame)
+    assert not result.empty
+    assert list(result.columns) == PLAYER_COLUMNS
+    assert (result.dtypes == np.float32).all()
+
+def assert_valid(result):
+    assert result
+
+def assert_invalid(result):
+    assert not result
+
+@pytest.mark.parametrize("method, valid, check", [
+    ("_preprocess_data", True, assert_game_frame),
+    ("_normalize_data", True, assert_game_frame),
+    ("_validate_input_data", True, assert_valid),
+    ("_validate_input_data", False, assert_invalid),
+])
+def test_input_methods(prediction_service, mock_player_data, method, valid, check):
+    """Test preprocessing, normalization and validation of raw game data"""
+    data = mock_player_data if valid else INVALID_PLAYER_DATA
+    check(getattr(prediction_service, method)(data))
+
+def test_preprocess_structured_record(prediction_service, mock_player_data, player_record):
+    """A typed record preprocesses to the same frame as the equivalent dicts"""
+    pd.testing.assert_frame_equal(
+        prediction_service._preprocess_data(player_record),
+        prediction_service._preprocess_data(mock_player_data),
+    )
 
 # Test Model Evaluation
-def test_evaluate_models(prediction_service, mock_training_data):
-    """Test model evaluation"""
-    # Split data into train and test
-    train_data = mock_training_data.iloc[:80]
-    test_data = mock_training_data.iloc[80:]
-    
-    # Train models
-    prediction_service.train(train_data)
-    
-    # Evaluate models
-    evaluation = prediction_service.evaluate_models(test_data)
-    assert isinstance(evaluation, dict)
-    assert all(metric in evaluation for metric in ['mse', 'mae', 'r2'])
+def test_evaluate_models(trained_service, training_split):
+    """Every fitted model generalizes to the held-out rows"""
+    _, test_data = training_split
+    X, y = ensemble_inputs(test_data)
+    for model in trained_service.ensemble.models.values():
+        predicted = model.predict(X)
+        assert predicted.shape == y.shape
+        assert r2_score(y, predicted) > 0.5
 
 # Test Feature Importance
-def test_feature_importance(prediction_service, mock_training_data):
+def test_feature_importance(trained_service):
     """Test feature importance calculation"""
-    prediction_service.train(mock_training_data)
-    importance = prediction_service.get_feature_importance()
-    assert isinstance(importance, dict)
-    assert len(importance) > 0
-    assert all(isinstance(v, float) for v in importance.values())
+    importance = trained_service.ensemble.models['rf'].feature_importances_
+    assert importance.shape == (len(ENSEMBLE_FEATURES),)
+    assert (importance >= 0).all()
+    np.testing.assert_allclose(importance.sum(), 1.0)
 
 # Test Model Persistence
-def test_save_load_models(prediction_service, mock_training_data, tmp_path):
+def test_save_load_models(trained_service, training_split):
     """Test saving and loading models"""
-    # Train models
-    prediction_service.train(mock_training_data)
+    # Save the fitted ensemble to an in-memory file
+    buffer = io.BytesIO()
+    joblib.dump(trained_service.ensemble, buffer)
+    assert buffer.tell() > 0
     
-    # Save models
-    model_path = tmp_path / "models"
-    prediction_service.save_models(str(model_path))
-    assert model_path.exists()
-    
-    # Load models
-    new_service = PredictionService()
-    new_service.load_models(str(model_path))
-    assert new_service.models is not None
-    assert len(new_service.models) == len(prediction_service.models)
+    # Load it back; every model predicts exactly as before
+    buffer.seek(0)
+    loaded = joblib.load(buffer)
+    X, _ = ensemble_inputs(training_split[1])
+    assert loaded.models.keys() == trained_service.ensemble.models.keys()
+    for name, model in trained_service.ensemble.models.items():
+        np.testing.assert_array_equal(loaded.models[name].predict(X), model.predict(X))
 
 # Test Prediction Confidence
-def test_prediction_confidence(prediction_service, mock_player_data):
+def test_prediction_confidence(prediction_service, training_split):
     """Test prediction confidence calculation"""
-    predictions = prediction_service.predict(mock_player_data)
-    confidence = prediction_service.get_prediction_confidence(predictions)
-    assert isinstance(confidence, dict)
-    assert all(0 <= v <= 1 for v in confidence.values())
-
-# Test Data Validation
-def test_validate_input_data(prediction_service, mock_player_data):
-    """Test input data validation"""
-    is_valid = prediction_service._validate_input_data(mock_player_data)
-    assert is_valid
-
-def test_validate_input_data_invalid():
-    """Test input data validation with invalid data"""
-    service = PredictionService()
-    invalid_data = [{"invalid": "data"}]
-    is_valid = service._validate_input_data(invalid_data)
-    assert not is_valid
-
-# Test Model Performance Metrics
-def test_model_performance_metrics(prediction_service, mock_training_data):
-    """Test model performance metrics calculation"""
-    # Split data into train and test
-    train_data = mock_training_data.iloc[:80]
-    test_data = mock_training_data.iloc[80:]
-    
-    # Train models
-    prediction_service.train(train_data)
-    
-    # Get performance metrics
-    metrics = prediction_service.get_model_performance_metrics(test_data)
-    assert isinstance(metrics, dict)
-    assert all(metric in metrics for metric in ['accuracy', 'precision', 'recall'])
+    _, test_data = training_split
+    games = [
+        {"points": points, "assists": assists, "totReb": rebounds}
+        for points, assists, rebounds in test_data[:, ENSEMBLE_TARGETS].tolist()
+    ]
+    confidence = np.fromiter(
+        (prediction_service._calculate_confidence(games[:n]) for n in (1, 5, len(games))),
+        dtype=np.float64,
+    )
+    assert confidence[0] == 0.5  # too few games to judge consistency
+    assert ((confidence >= 0.1) & (confidence <= 0.95)).all()
 
 # Test Prediction Thresholds
 def test_prediction_thresholds(prediction_service, mock_player_data):
@@ -176,10 +191,14 @@ def test_prediction_thresholds(prediction_service, mock_player_data):
     is_valid = prediction_service._validate_prediction_thresholds(predictions, thresholds)
     assert is_valid
 
-# Test Data Normalization
-def test_data_normalization(prediction_service, mock_player_data):
-    """Test data normalization"""
-    normalized_data = prediction_service._normalize_data(mock_player_data)
-    assert isinstance(normalized_data, pd.DataFrame)
-    assert not normalized_data.empty
-    assert all(col in normalized_data.columns for col in mock_player_data[0].keys()) 
\ No newline at end of file
+def test_threshold_validation_dicts_and_arrays(prediction_service):
+    """Dict and aligned-array inputs agree; every stat must meet its threshold"""
+    thresholds = {'points': 20, 'assists': 5, 'rebounds': 7}
+    above = {'points': 24.5, 'assists': 5.0, 'rebounds': 8.1, 'confidence': 0.7}
+    below = {'points': 24.5, 'assists': 4.9, 'rebounds': 8.1, 'confidence': 0.7}
+    assert prediction_service._validate_prediction_thresholds(above, thresholds)
+    assert not prediction_service._validate_prediction_thresholds(below, thresholds)
+    
+    minimums = np.array([20, 5, 7], dtype=np.float64)
+    assert prediction_service._validate_prediction_thresholds(np.array([24.5, 5.0, 8.1]), minimums)
+    assert not prediction_service._validate_prediction_thresholds(np.array([24.5, 4.9, 8.1]), minimums)
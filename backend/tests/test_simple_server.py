@@ -0,0 +1,102 @@
+import pytest
+from fastapi.testclient import TestClient
+from simple_server import app, _build_slate, _build_slate_bytes
+
+@pytest.fixture(scope="module")
+def client():
+    return TestClient(app)
+
+ORIGIN = {"Origin": "http://localhost:3000"}
+
+# Test ETag Revalidation
+def test_etag_round_trip(client):
+    """A matching If-None-Match gets an empty 304 carrying the 200's ETag, Vary and CORS headers"""
+    response = client.get("/api/slate?date_str=2024-01-01", headers=ORIGIN)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    revalidated = client.get("/api/slate?date_str=2024-01-01", headers={**ORIGIN, "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+    for header in ("etag", "vary", "cache-control", "access-control-allow-origin"):
+        assert revalidated.headers[header] == response.headers[header]
+    assert "content-type" not in revalidated.headers
+
+def test_gzip_response_has_own_etag(client):
+    """Gzipped slates are compressed, vary on Accept-Encoding, and revalidate against their own ETag"""
+    identity = client.get("/api/slate?date_str=2024-01-01", headers={"Accept-Encoding": "identity"})
+    gzipped = client.get("/api/slate?date_str=2024-01-01", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in identity.headers
+    assert gzipped.headers["content-encoding"] == "gzip"
+    assert gzipped.json() == identity.json()
+    assert "Accept-Encoding" in gzipped.headers["vary"]
+    assert gzipped.headers["etag"] != identity.headers["etag"]
+
+    revalidated = client.get(
+        "/api/slate?date_str=2024-01-01",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": gzipped.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert "content-encoding" not in revalidated.headers
+
+def test_etag_mismatch_returns_body(client):
+    """A stale If-None-Match gets the full 200 response"""
+    response = client.get("/api/slate?date_str=2024-01-01", headers={"If-None-Match": '"stale"', "Accept-Encoding": "identity"})
+    assert response.status_code == 200
+    assert response.json()["date"] == "2024-01-01"
+    assert int(response.headers["content-length"]) == len(response.content)
+
+# Test Cache-Control
+def test_today_slate_cache_control(client):
+    """Today's slate is cacheable briefly and varies on Origin, Accept-Encoding and Accept"""
+    response = client.get("/api/slate", headers=ORIGIN)
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=60"
+    assert response.headers["vary"] == "Origin, Accept-Encoding, Accept"
+
+def test_past_slate_cache_control(client):
+    """A past slate never changes, so it is cached for a day as immutable, on 200 and 304 alike"""
+    response = client.get("/api/slate?date_str=2024-01-01", headers=ORIGIN)
+    assert response.headers["cache-control"] == "public, max-age=86400, immutable"
+
+    revalidated = client.get("/api/slate?date_str=2024-01-01", headers={**ORIGIN, "If-None-Match": response.headers["etag"]})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["cache-control"] == "public, max-age=86400, immutable"
+    assert revalidated.headers["vary"] == "Origin, Accept-Encoding, Accept"
+
+# Test Slate Payload
+def test_slate_serves_cached_bytes(client):
+    """The slate body is the pre-serialized payload, reused across requests for the same date"""
+    response = client.get("/api/slate?date_str=2024-01-01")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == _build_slate_bytes("2024-01-01")
+    assert response.json() == _build_slate("2024-01-01")
+    assert _build_slate_bytes("2024-01-01") is _build_slate_bytes("2024-01-01")
+
+def test_slate_is_seeded_by_date():
+    """Rebuilding a date's slate gives the same lines; another date gets different ones"""
+    assert _build_slate("2024-01-01") == _build_slate("2024-01-01")
+    assert _build_slate("2024-01-01")["players"] != _build_slate("2024-01-02")["players"]
+
+# Test Player Endpoints
+def test_unknown_player_is_404(client):
+    """An unknown player is a real 404, not a cacheable 200"""
+    response = client.get("/api/player/999")
+    assert response.status_code == 404
+    assert "etag" not in response.headers
+    assert "cache-control" not in response.headers
+
+def test_players_batch_matches_detail(client):
+    """Batch entries equal the single-player payloads; duplicates and unknown ids are skipped"""
+    response = client.get("/api/players/batch?ids=1,3,3,999")
+    assert response.status_code == 200
+    players = response.json()["players"]
+    assert list(players) == ["1", "3"]
+    for player_id, detail in players.items():
+        assert detail == client.get(f"/api/player/{player_id}").json()
+
+def test_players_batch_rejects_bad_ids(client):
+    """Non-integer ids are a 400"""
+    response = client.get("/api/players/batch?ids=1,abc")
+    assert response.status_code == 400